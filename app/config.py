@@ -7,13 +7,123 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_STANDARD_MODEL = os.getenv("OPENAI_STANDARD_MODEL", "gpt-4.1-mini")
 OPENAI_PREMIUM_MODEL = os.getenv("OPENAI_PREMIUM_MODEL", "gpt-4.1")
 
+# OpenAI HTTP 클라이언트 (앱 수명 동안 모델별 ChatOpenAI가 공유하는 커넥션 풀)
+OPENAI_TIMEOUT: float = float(os.getenv("OPENAI_TIMEOUT", "60.0"))
+OPENAI_CONNECT_TIMEOUT: float = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5.0"))
+OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY: float = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60.0"))
+OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# LLM 답장 캐시 (정규화된 프롬프트 + 모델명 기준)
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600"))
+
+# LLM 호출 스케줄러 (모델별 동시 호출 수 / 분당 요청·토큰 수, 0이면 제한 없음)
+LLM_STANDARD_MAX_CONCURRENCY: int = int(os.getenv("LLM_STANDARD_MAX_CONCURRENCY", "16"))
+LLM_STANDARD_RPM: int = int(os.getenv("LLM_STANDARD_RPM", "500"))
+LLM_STANDARD_TPM: int = int(os.getenv("LLM_STANDARD_TPM", "200000"))
+LLM_PREMIUM_MAX_CONCURRENCY: int = int(os.getenv("LLM_PREMIUM_MAX_CONCURRENCY", "16"))
+LLM_PREMIUM_RPM: int = int(os.getenv("LLM_PREMIUM_RPM", "500"))
+LLM_PREMIUM_TPM: int = int(os.getenv("LLM_PREMIUM_TPM", "30000"))
+# 대기열에서 이 시간 안에 차례가 오지 않으면 503
+LLM_MAX_QUEUE_WAIT: float = float(os.getenv("LLM_MAX_QUEUE_WAIT", "10.0"))
+
 DATABASE_URL = os.getenv("DATABASE_URL")
-SQLALCHEMY_ECHO: bool = os.getenv("SQLALCHEMY_ECHO", "true").lower() == "true"
+# SQL 로그는 로컬 디버깅용 (운영에서 모든 쿼리를 찍지 않도록 기본 false)
+SQLALCHEMY_ECHO: bool = os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"
+
+# DB 커넥션 풀
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# asyncpg prepared statement 캐시 크기 (커넥션당)
+DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+# PgBouncer transaction/statement 풀링 뒤에서 쓸 때 true (prepared statement 캐시 끔)
+DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+# 시작 시 스키마 버전(alembic head) 확인
+# - strict: 다르면 시작 실패 / warn: 경고 로그만 / off: 확인 안 함
+DB_SCHEMA_CHECK: str = os.getenv("DB_SCHEMA_CHECK", "strict").lower()
+
+# 일일 사용량 카운터
+# - db (기본): 요청마다 UPDATE 한 번 (여러 프로세스에서도 한도 정확)
+# - memory (선택): 프로세스 메모리에서 세고 주기적으로 일괄 반영 (프로세스 N개면 최대 N배까지 허용 가능)
+USAGE_COUNTER_BACKEND: str = os.getenv("USAGE_COUNTER_BACKEND", "db").lower()
+USAGE_COUNTER_FLUSH_INTERVAL: float = float(os.getenv("USAGE_COUNTER_FLUSH_INTERVAL", "5.0"))
+USAGE_COUNTER_FLUSH_BATCH_SIZE: int = int(os.getenv("USAGE_COUNTER_FLUSH_BATCH_SIZE", "500"))
+USAGE_COUNTER_REFRESH_SECONDS: float = float(os.getenv("USAGE_COUNTER_REFRESH_SECONDS", "60.0"))
+USAGE_COUNTER_SHARDS: int = int(os.getenv("USAGE_COUNTER_SHARDS", "16"))
+
+# 구독 상태 캐시 (expires_at이 더 이르면 그때 만료)
+SUBSCRIPTION_CACHE_MAX_ENTRIES: int = int(os.getenv("SUBSCRIPTION_CACHE_MAX_ENTRIES", "10000"))
+SUBSCRIPTION_CACHE_TTL_SECONDS: float = float(os.getenv("SUBSCRIPTION_CACHE_TTL_SECONDS", "300"))
+# 만료된 프리미엄 구독 일괄 처리 주기 (초, 0이면 끔)
+SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL: float = float(os.getenv("SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL", "60"))
+
+# 생성 기록(message_history) 비동기 저장 (큐가 가득 차면 버림)
+MESSAGE_HISTORY_ENABLED: bool = os.getenv("MESSAGE_HISTORY_ENABLED", "true").lower() == "true"
+MESSAGE_HISTORY_QUEUE_SIZE: int = int(os.getenv("MESSAGE_HISTORY_QUEUE_SIZE", "10000"))
+MESSAGE_HISTORY_BATCH_SIZE: int = int(os.getenv("MESSAGE_HISTORY_BATCH_SIZE", "200"))
+MESSAGE_HISTORY_FLUSH_INTERVAL: float = float(os.getenv("MESSAGE_HISTORY_FLUSH_INTERVAL", "1.0"))
+# 월별 파티션: 보관 개월 수(0이면 삭제 안 함) / 미리 만들어 둘 개월 수 / 유지보수 주기(초, 0이면 끔)
+MESSAGE_HISTORY_RETENTION_MONTHS: int = int(os.getenv("MESSAGE_HISTORY_RETENTION_MONTHS", "12"))
+MESSAGE_HISTORY_PARTITIONS_AHEAD: int = int(os.getenv("MESSAGE_HISTORY_PARTITIONS_AHEAD", "2"))
+MESSAGE_HISTORY_MAINTENANCE_INTERVAL: float = float(os.getenv("MESSAGE_HISTORY_MAINTENANCE_INTERVAL", "21600"))
 
 # Naver Clova OCR
 NAVER_OCR_SECRET_KEY = os.getenv("NAVER_OCR_SECRET_KEY")
 NAVER_OCR_INVOKE_URL = os.getenv("NAVER_OCR_INVOKE_URL")
 
+# Naver Clova OCR HTTP 클라이언트 (앱 수명 동안 재사용하는 커넥션 풀)
+NAVER_OCR_TIMEOUT: float = float(os.getenv("NAVER_OCR_TIMEOUT", "30.0"))
+NAVER_OCR_CONNECT_TIMEOUT: float = float(os.getenv("NAVER_OCR_CONNECT_TIMEOUT", "5.0"))
+NAVER_OCR_MAX_CONNECTIONS: int = int(os.getenv("NAVER_OCR_MAX_CONNECTIONS", "20"))
+NAVER_OCR_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("NAVER_OCR_MAX_KEEPALIVE_CONNECTIONS", "10"))
+NAVER_OCR_KEEPALIVE_EXPIRY: float = float(os.getenv("NAVER_OCR_KEEPALIVE_EXPIRY", "60.0"))
+NAVER_OCR_HTTP2: bool = os.getenv("NAVER_OCR_HTTP2", "false").lower() == "true"
+
+# OCR 호출 안정화 (시도별 데드라인 / 재시도 예산 / 헤지 요청 / 서킷 브레이커)
+OCR_ATTEMPT_TIMEOUT: float = float(os.getenv("OCR_ATTEMPT_TIMEOUT", "10.0"))
+OCR_MAX_ATTEMPTS: int = int(os.getenv("OCR_MAX_ATTEMPTS", "3"))
+OCR_RETRY_BACKOFF_BASE: float = float(os.getenv("OCR_RETRY_BACKOFF_BASE", "0.2"))
+OCR_RETRY_BACKOFF_MAX: float = float(os.getenv("OCR_RETRY_BACKOFF_MAX", "2.0"))
+OCR_RETRY_BUDGET_RATIO: float = float(os.getenv("OCR_RETRY_BUDGET_RATIO", "0.2"))
+OCR_RETRY_BUDGET_MAX_TOKENS: float = float(os.getenv("OCR_RETRY_BUDGET_MAX_TOKENS", "10"))
+OCR_HEDGE_ENABLED: bool = os.getenv("OCR_HEDGE_ENABLED", "true").lower() == "true"
+OCR_HEDGE_MIN_DELAY: float = float(os.getenv("OCR_HEDGE_MIN_DELAY", "1.0"))
+OCR_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("OCR_CIRCUIT_FAILURE_THRESHOLD", "5"))
+OCR_CIRCUIT_RECOVERY_SECONDS: float = float(os.getenv("OCR_CIRCUIT_RECOVERY_SECONDS", "30.0"))
+
+# OCR 결과를 좌표 기반 화자 태그 대화로 재구성 (나: / 상대:)
+OCR_LAYOUT_ENCODER_ENABLED: bool = os.getenv("OCR_LAYOUT_ENCODER_ENABLED", "true").lower() == "true"
+
+# OCR 결과 캐시 (이미지 SHA-256 기준)
+OCR_CACHE_ENABLED: bool = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_MAX_ENTRIES: int = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "512"))
+OCR_CACHE_TTL_SECONDS: float = float(os.getenv("OCR_CACHE_TTL_SECONDS", "86400"))
+OCR_CACHE_DIR: str | None = os.getenv("OCR_CACHE_DIR") or None  # 비우면 디스크 캐시 사용 안 함
+# 디스크 캐시 파일 수 상한 / 만료 파일 정리 주기(초) (시작 시에도 한 번 정리)
+OCR_CACHE_DISK_MAX_ENTRIES: int = int(os.getenv("OCR_CACHE_DISK_MAX_ENTRIES", "10000"))
+OCR_CACHE_DISK_SWEEP_INTERVAL: float = float(os.getenv("OCR_CACHE_DISK_SWEEP_INTERVAL", "3600"))
+
+# OCR 전처리 (축소 / JPEG 재인코딩 / 상태바·키보드 크롭)
+OCR_PREPROCESS_ENABLED: bool = os.getenv("OCR_PREPROCESS_ENABLED", "true").lower() == "true"
+OCR_PREPROCESS_MAX_DIMENSION: int = int(os.getenv("OCR_PREPROCESS_MAX_DIMENSION", "2048"))
+# Clova가 받는 포맷 중 jpeg / png만 지원 (WebP는 Clova가 받지 않아서 제외, jpg는 jpeg로 취급)
+OCR_PREPROCESS_FORMAT: str = os.getenv("OCR_PREPROCESS_FORMAT", "jpeg").lower()
+if OCR_PREPROCESS_FORMAT == "jpg":
+    OCR_PREPROCESS_FORMAT = "jpeg"
+OCR_PREPROCESS_QUALITY: int = int(os.getenv("OCR_PREPROCESS_QUALITY", "85"))
+OCR_PREPROCESS_CROP_TOP: float = float(os.getenv("OCR_PREPROCESS_CROP_TOP", "0.0"))
+OCR_PREPROCESS_CROP_BOTTOM: float = float(os.getenv("OCR_PREPROCESS_CROP_BOTTOM", "0.0"))
+
+# 여러 장 분석 (/rizz/analyze-images)
+MAX_IMAGES_PER_REQUEST: int = int(os.getenv("MAX_IMAGES_PER_REQUEST", "10"))
+OCR_MAX_CONCURRENCY: int = int(os.getenv("OCR_MAX_CONCURRENCY", "4"))
+
 if OPENAI_API_KEY is None:
     raise RuntimeError("OPENAI_API_KEY is not set. Please add it to your .env file.")
 
@@ -31,4 +141,9 @@ if NAVER_OCR_SECRET_KEY is None:
     raise RuntimeError("NAVER_OCR_SECRET_KEY is not set. Please add it to your .env file.")
 
 if NAVER_OCR_INVOKE_URL is None:
-    raise RuntimeError("NAVER_OCR_INVOKE_URL is not set. Please add it to your .env file.")
\ No newline at end of file
+    raise RuntimeError("NAVER_OCR_INVOKE_URL is not set. Please add it to your .env file.")
+
+if OCR_PREPROCESS_FORMAT not in ("jpeg", "png"):
+    raise RuntimeError(
+        f"OCR_PREPROCESS_FORMAT must be 'jpeg' or 'png' (got '{OCR_PREPROCESS_FORMAT}')."
+    )
\ No newline at end of file
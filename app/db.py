@@ -1,17 +1,80 @@
 # app/db.py
-from typing import AsyncGenerator
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator, AsyncIterator
+from uuid import uuid4
+
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
-from app.config import DATABASE_URL, SQLALCHEMY_ECHO
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config import (
+    DATABASE_URL,
+    SQLALCHEMY_ECHO,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_CACHE_SIZE,
+    DB_PGBOUNCER,
+    DB_SCHEMA_CHECK,
+)
+from app.services.metrics import register_metrics
+
+logger = logging.getLogger("syrano")
+
+ALEMBIC_INI_PATH = Path(__file__).resolve().parent.parent / "alembic.ini"
 
 class Base(DeclarativeBase):
     """모든 엔티티가 상속할 공통 Base."""
     pass
 
+
+class _PoolStats:
+    """커넥션 풀 지표 (풀이 dispose/recreate 돼도 유지되도록 모듈 단위로 보관)."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_created = 0
+        self.invalidations = 0
+        self.waits: deque[float] = deque(maxlen=1000)
+        self.wait_max = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.checkouts += 1
+        self.waits.append(wait)
+        self.wait_max = max(self.wait_max, wait)
+
+
+_pool_stats = _PoolStats()
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    풀에서 커넥션을 꺼낼 때까지 기다린 시간을 기록하는 AsyncAdaptedQueuePool.
+    (pool_size + max_overflow가 모두 사용 중이면 여기서 대기 → pool_timeout 초과 시 TimeoutError)
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            _pool_stats.timeouts += 1
+            raise
+        _pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
 # 로컬 환경이면 SSL 비활성화, 프로덕션이면 SSL 활성화
 connect_args = {}
 if "localhost" in DATABASE_URL or "127.0.0.1" in DATABASE_URL:
@@ -19,13 +82,68 @@ if "localhost" in DATABASE_URL or "127.0.0.1" in DATABASE_URL:
 else:
     connect_args = {"ssl": "require"}
 
+if DATABASE_URL.startswith("postgresql+asyncpg"):
+    if DB_PGBOUNCER:
+        # PgBouncer(transaction 풀링)는 백엔드 커넥션이 바뀔 수 있어서
+        # prepared statement 캐시를 끄고 이름도 매번 새로 생성
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+    else:
+        connect_args.update(
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+            prepared_statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        )
+
 engine = create_async_engine(
     DATABASE_URL,
     echo=SQLALCHEMY_ECHO,
     future=True,
-    connect_args=connect_args
+    connect_args=connect_args,
+    poolclass=InstrumentedAsyncPool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _on_connect(dbapi_connection, connection_record) -> None:
+    _pool_stats.connections_created += 1
+
+
+@event.listens_for(engine.sync_engine, "invalidate")
+def _on_invalidate(dbapi_connection, connection_record, exception) -> None:
+    _pool_stats.invalidations += 1
+
+
+def pool_stats() -> dict:
+    """커넥션 풀 상태 + 체크아웃 대기 시간 (GET /metrics → db_pool)."""
+    pool = engine.sync_engine.pool
+    waits = sorted(_pool_stats.waits)
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # overflow()는 풀이 덜 찼으면 음수
+        "overflow_in_use": max(0, pool.overflow()),
+        "checkouts": _pool_stats.checkouts,
+        "checkout_timeouts": _pool_stats.timeouts,
+        "checkout_wait_avg_ms": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+        "checkout_wait_p95_ms": round(waits[int(len(waits) * 0.95) - 1] * 1000, 3) if len(waits) >= 20 else None,
+        "checkout_wait_max_ms": round(_pool_stats.wait_max * 1000, 3),
+        "connections_created": _pool_stats.connections_created,
+        "invalidations": _pool_stats.invalidations,
+    }
+
+
+register_metrics("db_pool", pool_stats)
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -36,10 +154,45 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
-async def init_db() -> None:
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    블록 안에서만 쓰는 짧은 세션.
+    블록을 나가면 커넥션을 풀에 바로 반납 (OCR/LLM 같은 긴 외부 호출 전에 사용).
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async def check_schema_version() -> None:
     """
-    앱 시작 시 한 번 테이블 생성.
+    앱 시작 시 DB 스키마가 최신 마이그레이션(head)인지만 확인.
+    (테이블 생성/변경은 `pdm run migrate`로 배포 전에 한 번만 실행)
     """
-    from app import models  # noqa: F401
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+    if DB_SCHEMA_CHECK == "off":
+        return
+
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(Config(str(ALEMBIC_INI_PATH)))
+    expected = set(script.get_heads())
+
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = {row[0] for row in result}
+    except exc.ProgrammingError:
+        # alembic_version 테이블 없음 = 마이그레이션을 한 번도 안 돌린 DB
+        current = set()
+
+    if current == expected:
+        logger.info(f"Database schema is up to date ({', '.join(sorted(current))}).")
+        return
+
+    message = (
+        f"Database schema version mismatch: current={sorted(current) or None}, "
+        f"expected={sorted(expected)}. Run `pdm run migrate` (alembic upgrade head)."
+    )
+    if DB_SCHEMA_CHECK == "strict":
+        raise RuntimeError(message)
+    logger.warning(message)
@@ -0,0 +1,12 @@
+# app/dependencies.py
+"""
+lifespan에서 만든 공유 리소스를 라우터에 주입하는 의존성
+"""
+from fastapi import Request
+
+from app.services.ocr.base import OCRService
+
+
+def get_ocr_service(request: Request) -> OCRService:
+    """앱 전체에서 하나만 쓰는 OCR 서비스."""
+    return request.app.state.ocr_service
@@ -4,8 +4,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.db import init_db
-from app.routers import rizz, auth, billing, profiles  # ✅ profiles 추가
+from app.db import check_schema_version
+from app.services.llm import init_llm_clients, close_llm_clients
+from app.services.usage_counter import init_usage_counter, close_usage_counter
+from app.services.message_history import (
+    init_message_history_writer,
+    close_message_history_writer,
+    start_history_maintenance,
+    stop_history_maintenance,
+)
+from app.services.subscriptions import start_expiry_sweeper, stop_expiry_sweeper
+from app.services.ocr.factory import create_ocr_http_client, create_ocr_service
+from app.routers import rizz, auth, billing, profiles, metrics, history  # ✅ profiles 추가
 
 logger = logging.getLogger("syrano")
 logging.basicConfig(level=logging.INFO)
@@ -13,14 +23,38 @@ logging.basicConfig(level=logging.INFO)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    logger.info("Initializing database...")
-    await init_db()
-    logger.info("Database initialized.")
+    # 스키마 생성/변경은 마이그레이션(pdm run migrate)이 담당, 여기선 버전만 확인
+    await check_schema_version()
+
+    # OCR: 앱 수명 동안 keep-alive 커넥션 풀 하나를 공유
+    ocr_http_client = create_ocr_http_client()
+    app.state.ocr_service = create_ocr_service(ocr_http_client)
+
+    # LLM: 모델별 ChatOpenAI + 공유 커넥션 풀을 한 번만 생성
+    init_llm_clients()
+
+    # 사용량 카운터 (memory 백엔드면 주기적 일괄 반영 시작)
+    await init_usage_counter()
+
+    # 생성 기록은 큐에 모았다가 백그라운드에서 일괄 INSERT
+    await init_message_history_writer()
+
+    # message_history 월별 파티션 미리 생성 + 보관 기간 지난 파티션 삭제
+    start_history_maintenance()
+
+    # 만료된 프리미엄 구독을 주기적으로 한 번에 처리
+    start_expiry_sweeper()
 
     yield  # <-- 여기까지가 startup, 여기서부터는 앱이 돌아가는 동안
 
     # shutdown (필요하면 연결 정리, 리소스 반환 등 여기에)
     logger.info("Shutting down Syrano API...")
+    await stop_expiry_sweeper()
+    await stop_history_maintenance()
+    await close_usage_counter()  # 남은 사용량 증가분 DB 반영
+    await close_message_history_writer()  # 큐에 남은 생성 기록 저장
+    await ocr_http_client.aclose()
+    await close_llm_clients()
 
 app = FastAPI(title="Syrano API", lifespan=lifespan)
 
@@ -41,4 +75,6 @@ def health_check():
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(rizz.router, prefix="/rizz", tags=["rizz"])
 app.include_router(billing.router, prefix="/billing", tags=["billing"])
-app.include_router(profiles.router, prefix="/profiles", tags=["profiles"])  # ✅ 추가
\ No newline at end of file
+app.include_router(profiles.router, prefix="/profiles", tags=["profiles"])  # ✅ 추가
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(history.router, prefix="/history", tags=["history"])
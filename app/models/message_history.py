@@ -2,10 +2,10 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import DateTime, ForeignKey, Index, Text, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -17,17 +17,28 @@ if TYPE_CHECKING:
 
 class MessageHistory(Base):
     __tablename__ = "message_history"
+    __table_args__ = (
+        # 유저별 최신순 keyset 페이지 조회 (GET /history)
+        Index(
+            "ix_message_history_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # created_at 기준 월별 파티션 (파티션 생성/삭제는 app/services/message_history.py)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    # 파티션 키(created_at)가 PK에 포함돼야 해서 (id, created_at) 복합 PK
     id: Mapped[str] = mapped_column(
-        String(36),
+        UUID(as_uuid=False),
         primary_key=True,
         default=generate_uuid,
     )
 
     user_id: Mapped[str] = mapped_column(
-        String(36),
+        UUID(as_uuid=False),
         ForeignKey("users.id", ondelete="CASCADE"),
-        index=True,
     )
 
     conversation: Mapped[str] = mapped_column(Text)
@@ -39,7 +50,8 @@ class MessageHistory(Base):
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
     )
 
-    user: Mapped["User"] = relationship(back_populates="messages")
\ No newline at end of file
+    user: Mapped["User"] = relationship(back_populates="messages")
@@ -4,7 +4,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String, Integer, Text, ForeignKey, Index, func
+from sqlalchemy import DateTime, String, Integer, Text, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -18,13 +19,13 @@ class Profile(Base):
     __tablename__ = "profiles"
 
     id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False),
         primary_key=True, 
         default=generate_uuid
     )
     
     user_id: Mapped[str] = mapped_column(
-        String(36), 
+        UUID(as_uuid=False),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
     )
@@ -53,6 +54,13 @@ class Profile(Base):
     user: Mapped["User"] = relationship(back_populates="profiles")
 
     # ✅ Index
+    # 유저별 최신순 커서 조회 + 목록 summary 컬럼 포함(INCLUDE) → memo 없는 목록은 index-only scan
     __table_args__ = (
-        Index("idx_profiles_user_id", "user_id"),
+        Index(
+            "ix_profiles_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_include=["name", "age", "gender", "updated_at"],
+        ),
     )
\ No newline at end of file
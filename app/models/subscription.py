@@ -4,7 +4,8 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import datetime, date
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Integer, Date
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, Integer, Date, Index, text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db import Base
@@ -16,16 +17,24 @@ if TYPE_CHECKING:
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # 만료 스위퍼용 부분 인덱스 (프리미엄 구독만)
+        Index(
+            "ix_subscriptions_premium_expires_at",
+            "expires_at",
+            postgresql_where=text("is_premium"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
-        String(36),
+        UUID(as_uuid=False),
         primary_key=True,
         default=generate_uuid,
     )
 
     # 유저당 구독 1개만 허용 (UNIQUE)
     user_id: Mapped[str] = mapped_column(
-        String(36),
+        UUID(as_uuid=False),
         ForeignKey("users.id", ondelete="CASCADE"),
         index=True,
         unique=True,
@@ -1,4 +1,4 @@
-from app.models.profile import Profile
+from app.services.rizz_context import ProfileContext
 
 
 def build_system_prompt() -> str:
@@ -17,18 +17,24 @@ def build_system_prompt() -> str:
 
 def build_user_prompt(
     conversation: str,
-    profile: Profile,
+    profile: ProfileContext | None,
     num_suggestions: int = 3,
+    speaker_tagged: bool = False,
 ) -> str:
     """
-    사용자 프롬프트 (Profile 기반)
-    """
-    # None 처리
-    age_str = f"{profile.age}세" if profile.age else "알 수 없음"
-    gender_str = profile.gender or "알 수 없음"
-    memo_str = profile.memo or "없음"
+    사용자 프롬프트 (Profile 기반, Profile 없으면 대화만으로)
     
-    profile_info = f"""
+    speaker_tagged: 대화가 "나:" / "상대:" 화자 태그 형식일 때만 태그 설명 추가
+    """
+    if profile is None:
+        profile_info = "상대방 정보: 없음"
+    else:
+        # None 처리
+        age_str = f"{profile.age}세" if profile.age else "알 수 없음"
+        gender_str = profile.gender or "알 수 없음"
+        memo_str = profile.memo or "없음"
+        
+        profile_info = f"""
 상대방 정보:
 - 이름: {profile.name}
 - 나이: {age_str}
@@ -36,10 +42,15 @@ def build_user_prompt(
 - 메모: {memo_str}
 """.strip()
 
+    if speaker_tagged:
+        conversation_header = '대화 내용 (OCR로 추출됨, 오타 있을 수 있음. "나:"는 사용자, "상대:"는 상대방 메시지):'
+    else:
+        conversation_header = "대화 내용 (OCR로 추출됨, 오타 있을 수 있음):"
+
     return f"""
 {profile_info}
 
-대화 내용 (OCR로 추출됨, 오타 있을 수 있음):
+{conversation_header}
 {conversation}
 
 위 대화를 분석하고, 다음 조건에 맞는 답장을 {num_suggestions}개 추천해줘:
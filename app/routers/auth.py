@@ -4,14 +4,16 @@ import logging
 from typing import Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
+from app.schemas.common import UUIDStr
 from app.services.users import get_or_create_anonymous_user
 
-from app.services.subscriptions import get_subscription_by_user_id
+from app.services.etag import etag_matches, make_etag, not_modified, set_etag
+from app.services.subscriptions import get_subscription_status
 
 logger = logging.getLogger("syrano")
 
@@ -63,7 +65,9 @@ async def auth_anonymous(
 
 @router.get("/me/subscription", response_model=SubscriptionStatusResponse)
 async def get_my_subscription(
-    user_id: str,
+    user_id: UUIDStr,
+    response: Response,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
@@ -71,8 +75,10 @@ async def get_my_subscription(
 
     - Query string으로 user_id를 받는다.
     - 해당 user_id의 Subscription이 없으면 404를 반환한다.
+    - 구독 상태 캐시를 먼저 보고, 없을 때만 DB 조회
+    - ETag: 구독 상태(is_premium / plan_type / expires_at), If-None-Match가 같으면 304
     """
-    subscription = await get_subscription_by_user_id(session, user_id)
+    subscription = await get_subscription_status(session, user_id)
 
     if subscription is None:
         raise HTTPException(
@@ -80,6 +86,17 @@ async def get_my_subscription(
             detail="구독 정보를 찾을 수 없어요.",
         )
 
+    etag = make_etag(
+        "subscription",
+        subscription.user_id,
+        subscription.is_premium,
+        subscription.plan_type,
+        subscription.expires_at,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     return SubscriptionStatusResponse(
         user_id=subscription.user_id,
         is_premium=subscription.is_premium,
@@ -10,6 +10,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
+from app.schemas.common import UUIDStr
 from app.services.subscriptions import (
     activate_subscription,
     get_subscription_by_user_id,
@@ -20,7 +21,7 @@ router = APIRouter()
 
 
 class SubscribeRequest(BaseModel):
-    user_id: str
+    user_id: UUIDStr
     plan_type: Literal["weekly", "monthly"]
 
 
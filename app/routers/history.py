@@ -0,0 +1,42 @@
+# app/routers/history.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_session
+from app.schemas.common import UUIDStr
+from app.schemas.history import HistoryItemResponse, HistoryListResponse
+from app.services.message_history import get_message_history_page
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+router = APIRouter()
+
+
+@router.get("", response_model=HistoryListResponse)
+async def get_history_endpoint(
+    user_id: UUIDStr,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    답장 생성 기록 조회 (최신순, 커서 페이지네이션)
+
+    - 첫 페이지: cursor 없이 호출
+    - 다음 페이지: 응답의 next_cursor를 cursor로 전달 (null이면 마지막 페이지)
+    - 방금 생성한 기록은 백그라운드 저장 후(수 초 이내) 보임
+    """
+    rows, next_cursor = await get_message_history_page(session, user_id, limit, cursor)
+    return HistoryListResponse(
+        items=[
+            HistoryItemResponse(
+                id=row.id,
+                conversation=row.conversation,
+                suggestions=(row.suggestions or {}).get("items", []),
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+    )
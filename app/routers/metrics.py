@@ -0,0 +1,16 @@
+# app/routers/metrics.py
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.services.metrics import collect_metrics
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics():
+    """
+    캐시 히트율 등 프로세스 내 운영 지표 조회 (워커별 값)
+    """
+    return collect_metrics()
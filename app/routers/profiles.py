@@ -3,10 +3,13 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_session
+from app.schemas.common import UUIDStr
+from app.services.etag import etag_matches, make_etag, not_modified, set_etag
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.schemas.profile import (
     ProfileCreateRequest,
     ProfileUpdateRequest,
@@ -16,7 +19,9 @@ from app.schemas.profile import (
 from app.services.profiles import (
     create_profile,
     get_profile_by_id,
-    get_profiles_by_user_id,
+    get_profile_version,
+    get_profiles_page,
+    get_profiles_version,
     update_profile,
     delete_profile,
 )
@@ -54,17 +59,38 @@ async def create_profile_endpoint(
 
 @router.get("", response_model=ProfileListResponse)
 async def get_profiles_endpoint(
-    user_id: str,
+    user_id: UUIDStr,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    summary: bool = Query(False, description="true면 memo 제외"),
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    사용자의 프로필 목록 조회
+    사용자의 프로필 목록 조회 (최신순, 커서 페이지네이션)
     
-    - Query parameter: user_id
+    - Query parameter: user_id, limit, cursor (이전 응답의 next_cursor), summary
+    - limit / cursor 둘 다 없으면 기존 클라이언트와 호환되도록 전체 목록 (next_cursor 없음)
+    - cursor만 있으면 limit은 DEFAULT_PAGE_SIZE
+    - ETag: 목록 버전(개수 + 최근 updated_at) + 페이지 파라미터, If-None-Match가 같으면 304
     """
+    if limit is None and cursor is not None:
+        limit = DEFAULT_PAGE_SIZE
+
     try:
-        profiles = await get_profiles_by_user_id(session, user_id)
-        return ProfileListResponse(profiles=profiles)
+        count, last_updated_at = await get_profiles_version(session, user_id)
+        etag = make_etag("profiles", user_id, count, last_updated_at, limit, cursor, summary)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_etag(response, etag)
+
+        profiles, next_cursor = await get_profiles_page(
+            session, user_id, limit, cursor, summary=summary
+        )
+        return ProfileListResponse(profiles=profiles, next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Failed to get profiles")
         raise HTTPException(
@@ -75,12 +101,23 @@ async def get_profiles_endpoint(
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
 async def get_profile_endpoint(
-    profile_id: str,
+    profile_id: UUIDStr,
+    response: Response,
+    if_none_match: str | None = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
     특정 프로필 조회
+    
+    - ETag: id + updated_at, If-None-Match가 같으면 updated_at만 조회하고 304
     """
+    if if_none_match is not None:
+        updated_at = await get_profile_version(session, profile_id)
+        if updated_at is not None:
+            etag = make_etag("profile", profile_id, updated_at)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
     profile = await get_profile_by_id(session, profile_id)
     
     if profile is None:
@@ -89,12 +126,13 @@ async def get_profile_endpoint(
             detail="프로필을 찾을 수 없어요.",
         )
     
+    set_etag(response, make_etag("profile", profile.id, profile.updated_at))
     return profile
 
 
 @router.put("/{profile_id}", response_model=ProfileResponse)
 async def update_profile_endpoint(
-    profile_id: str,
+    profile_id: UUIDStr,
     body: ProfileUpdateRequest,
     session: AsyncSession = Depends(get_session),
 ):
@@ -132,7 +170,7 @@ async def update_profile_endpoint(
 
 @router.delete("/{profile_id}", status_code=204)
 async def delete_profile_endpoint(
-    profile_id: str,
+    profile_id: UUIDStr,
     session: AsyncSession = Depends(get_session),
 ):
     """
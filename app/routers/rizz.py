@@ -1,43 +1,123 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-import uuid
-from pathlib import Path
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, List
 
 from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, Form
-from sqlalchemy.ext.asyncio import AsyncSession
-import aiofiles
-
-from app.db import get_session
-from app.services.llm import generate_suggestions_from_conversation
-from app.services.subscriptions import (
-    get_subscription_by_user_id,
-    check_and_increment_usage, 
+from fastapi.responses import StreamingResponse
+
+from app.config import OCR_MAX_CONCURRENCY, MAX_IMAGES_PER_REQUEST
+from app.services.llm import (
+    LLMQueueTimeoutError,
+    generate_suggestions_from_conversation,
+    stream_suggestions_from_conversation,
 )
-from app.services.ocr.naver import NaverOCRService
-from app.services.profiles import get_profile_by_id
-from app.config import NAVER_OCR_SECRET_KEY, NAVER_OCR_INVOKE_URL   
+from app.services.ocr.base import OCRService, OCRUnavailableError, normalize_image_format
+from app.services.rizz_context import RizzContext, load_rizz_context
+from app.services.conversation import merge_ocr_texts
+from app.services.ocr.layout import is_speaker_tagged
+from app.services.message_history import record_message_history
+from app.dependencies import get_ocr_service
 from app.schemas.rizz import GenerateRequest, GenerateResponse
+from app.schemas.common import UUIDStr
 
 logger = logging.getLogger("syrano")
 router = APIRouter()
 
+# LLM 스케줄러 대기열이 밀려서 빠르게 실패시킨 경우 (503)
+LLM_BUSY_DETAIL = "요청이 많아 답장 생성이 지연되고 있어요. 잠시 후 다시 시도해주세요."
+
+
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 한 건 포맷."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_suggestion_events(
+    *,
+    context: RizzContext,
+    conversation_source: Callable[[], Awaitable[str]],
+    num_suggestions: int,
+    fresh: bool = False,
+    from_ocr: bool = False,
+) -> AsyncIterator[str]:
+    """
+    SSE 이벤트 순서: usage → suggestion (한 줄 완성될 때마다) → done
+    스트림 시작 후 발생한 오류는 HTTP 상태 대신 error 이벤트로 전달.
+
+    conversation_source: 대화 텍스트를 돌려주는 코루틴 함수 (OCR 등은 usage 이벤트 이후 실행)
+    from_ocr: OCR 결과면 화자 태그 대화인지 확인해서 프롬프트에 반영
+    """
+    yield _sse("usage", context.usage_info.model_dump())
+
+    try:
+        conversation = await conversation_source()
+
+        suggestions: list[str] = []
+        async for suggestion in stream_suggestions_from_conversation(
+            conversation=conversation,
+            context=context,
+            num_suggestions=num_suggestions,
+            fresh=fresh,
+            speaker_tagged=from_ocr and is_speaker_tagged(conversation),
+        ):
+            yield _sse("suggestion", {"index": len(suggestions), "text": suggestion})
+            suggestions.append(suggestion)
+
+        if not suggestions:
+            raise HTTPException(
+                status_code=500,
+                detail="메시지를 생성하지 못했어요. 다시 한 번 시도해볼래요?",
+            )
+
+        record_message_history(context.user_id, conversation, suggestions)
+        yield _sse("done", {"count": len(suggestions)})
+
+    except HTTPException as e:
+        yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+    except LLMQueueTimeoutError:
+        logger.warning("LLM queue wait exceeded while streaming")
+        yield _sse("error", {"status_code": 503, "detail": LLM_BUSY_DETAIL})
+    except OCRUnavailableError:
+        logger.warning("OCR unavailable while streaming")
+        yield _sse("error", {
+            "status_code": 503,
+            "detail": "이미지 인식 서비스가 일시적으로 불안정해요. 잠시 후 다시 시도해주세요.",
+        })
+    except Exception:
+        logger.exception("Error while streaming suggestions")
+        yield _sse("error", {
+            "status_code": 500,
+            "detail": "메시지 생성 중 오류가 발생했어요. 잠시 후 다시 시도해주세요.",
+        })
+
+
+def _event_stream_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 프록시 버퍼링 방지
+        },
+    )
+
+
 @router.post("/generate", response_model=GenerateResponse)
 async def generate_rizz(
     req: GenerateRequest,
-    session: AsyncSession = Depends(get_session),
 ):
     """
     Rizz 메시지 생성 엔드포인트 (텍스트 입력).
     """
     
-    # 1) 사용량 체크 및 증가
-    usage_info = await check_and_increment_usage(session, req.user_id)  # ✅ 받기
+    # 1) Profile 조회 (선택) + 사용량 체크 및 증가 → 여기서 DB 커넥션 반납
+    context = await load_rizz_context(req.user_id, req.profile_id)
     
-    # 2) is_premium 조회
-    subscription = await get_subscription_by_user_id(session, req.user_id)
-    is_premium = subscription.is_premium
+    # 2) is_premium (LLM 모델 선택용)
+    is_premium = context.is_premium
 
     logger.info(
         "Generate rizz called",
@@ -55,13 +135,13 @@ async def generate_rizz(
     try:
         suggestions = await generate_suggestions_from_conversation(
             conversation=req.conversation,
-            platform=req.platform,
-            relationship=req.relationship,
-            style=req.style,
-            tone=req.tone,
+            context=context,
             num_suggestions=req.num_suggestions,
-            is_premium=is_premium,
+            fresh=req.fresh,
         )
+    except LLMQueueTimeoutError as e:
+        logger.warning(f"LLM queue wait exceeded: {e}")
+        raise HTTPException(status_code=503, detail=LLM_BUSY_DETAIL) from e
     except Exception as e:
         logger.exception("Error while generating suggestions from LLM")
         raise HTTPException(
@@ -76,92 +156,235 @@ async def generate_rizz(
             detail="메시지를 생성하지 못했어요. 다시 한 번 시도해볼래요?",
         )
 
+    # 생성 기록은 큐에만 넣고 바로 응답 (DB 저장은 백그라운드)
+    record_message_history(req.user_id, req.conversation, suggestions)
+
     return GenerateResponse(
         suggestions=suggestions,
-        usage_info=usage_info,  # ✅ 추가
+        usage_info=context.usage_info,  # ✅ 추가
+    )
+
+@router.post("/generate/stream")
+async def generate_rizz_stream(
+    req: GenerateRequest,
+):
+    """
+    Rizz 메시지 생성 스트리밍 엔드포인트 (텍스트 입력, SSE).
+    
+    - 사용량 체크/프로필 검증은 /generate와 동일 (실패 시 일반 HTTP 에러)
+    - 이후 usage → suggestion... → done 이벤트 순서로 전송
+    """
+    context = await load_rizz_context(req.user_id, req.profile_id)
+    
+    async def conversation_source() -> str:
+        return req.conversation
+    
+    return _event_stream_response(
+        _stream_suggestion_events(
+            context=context,
+            conversation_source=conversation_source,
+            num_suggestions=req.num_suggestions,
+            fresh=req.fresh,
+        )
     )
 
 @router.post("/analyze-image", response_model=GenerateResponse)
 async def analyze_image(
     image: UploadFile = File(...),
-    user_id: str = Form(...),
-    profile_id: str = Form(...),          
+    user_id: UUIDStr = Form(...),
+    profile_id: UUIDStr = Form(...),          
     num_suggestions: int = Form(3),
-    session: AsyncSession = Depends(get_session),
+    fresh: bool = Form(False),
+    ocr_service: OCRService = Depends(get_ocr_service),
 ):
     """
     이미지 기반 Rizz 메시지 생성 엔드포인트.
     
-    1. 사용량 체크 및 증가
-    2. Profile 조회
-    3. 이미지를 임시 저장
+    1. Profile 조회 (소유자 검증, 실패하면 사용량 차감 없이 404)
+    2. 사용량 체크 및 증가
+    3. 업로드 이미지를 메모리에서 바로 읽기 (임시 파일 없음)
     4. Naver Clova OCR로 텍스트 추출
     5. Profile 정보 + OCR 텍스트를 LLM에 전달
-    6. 임시 파일 삭제
     """
     
-    # 1) 사용량 체크 및 증가
-    usage_info = await check_and_increment_usage(session, user_id)  # ✅ 받기
-    
-    # 2) is_premium 조회 (LLM 모델 선택용)
-    subscription = await get_subscription_by_user_id(session, user_id)
-    is_premium = subscription.is_premium
+    # 1) Profile 조회 (소유자 검증 포함) + 사용량 체크 및 증가 → 여기서 DB 커넥션 반납
+    context = await load_rizz_context(user_id, profile_id)
     
-    # 3) Profile 조회
-    profile = await get_profile_by_id(session, profile_id)
-    if profile is None:
+    try:
+        # 4) 업로드 버퍼를 메모리에서 바로 사용 (디스크 저장 없음)
+        content = await image.read()
+        image_format = normalize_image_format(image.filename, image.content_type)
+        
+        logger.info(f"Image received: format={image_format}, size: {len(content)} bytes")
+        
+        # 5) OCR 실행 (lifespan에서 만든 공유 인스턴스)
+        conversation = await ocr_service.extract_text_from_bytes(content, image_format)
+        
+        logger.info(f"Extracted text length: {len(conversation)} characters")
+        logger.info(f"Extracted text preview: {conversation[:100]}...")
+        
+        # 텍스트 추출 검증
+        if not conversation or len(conversation.strip()) < 5:
+            raise HTTPException(
+                status_code=400,
+                detail="이미지에서 텍스트를 추출하지 못했어요. 더 선명한 이미지를 사용해주세요.",
+            )
+        
+        # 6) LLM 답변 생성
+        suggestions = await generate_suggestions_from_conversation(
+            conversation=conversation,
+            context=context,
+            num_suggestions=num_suggestions,
+            fresh=fresh,
+            speaker_tagged=is_speaker_tagged(conversation),
+        )
+        
+        if not suggestions:
+            raise HTTPException(
+                status_code=500,
+                detail="메시지를 생성하지 못했어요. 다시 한 번 시도해볼래요?",
+            )
+        
+        record_message_history(user_id, conversation, suggestions)
+        
+        return GenerateResponse(
+            suggestions=suggestions,
+            usage_info=context.usage_info,  # ✅ 추가
+        )
+        
+    except HTTPException:
+        raise
+    except LLMQueueTimeoutError as e:
+        logger.warning(f"LLM queue wait exceeded: {e}")
+        raise HTTPException(status_code=503, detail=LLM_BUSY_DETAIL) from e
+    except OCRUnavailableError as e:
+        logger.warning(f"OCR unavailable: {e}")
         raise HTTPException(
-            status_code=404,
-            detail="해당 프로필을 찾을 수 없어요.",
+            status_code=503,
+            detail="이미지 인식 서비스가 일시적으로 불안정해요. 잠시 후 다시 시도해주세요.",
+        ) from e
+    except Exception as e:
+        logger.exception("Error in analyze_image")
+        raise HTTPException(
+            status_code=500,
+            detail=f"이미지 분석 중 오류가 발생했어요: {str(e)}",
+        ) from e
+
+
+@router.post("/analyze-image/stream")
+async def analyze_image_stream(
+    image: UploadFile = File(...),
+    user_id: UUIDStr = Form(...),
+    profile_id: UUIDStr = Form(...),
+    num_suggestions: int = Form(3),
+    fresh: bool = Form(False),
+    ocr_service: OCRService = Depends(get_ocr_service),
+):
+    """
+    이미지 기반 Rizz 메시지 생성 스트리밍 엔드포인트 (SSE).
+    
+    - 사용량 체크/프로필 검증은 /analyze-image와 동일 (실패 시 일반 HTTP 에러)
+    - usage 이벤트를 먼저 보내고, OCR 후 답장을 한 줄씩 suggestion 이벤트로 전송
+    """
+    context = await load_rizz_context(user_id, profile_id)
+    
+    content = await image.read()
+    image_format = normalize_image_format(image.filename, image.content_type)
+    
+    async def conversation_source() -> str:
+        conversation = await ocr_service.extract_text_from_bytes(content, image_format)
+        if not conversation or len(conversation.strip()) < 5:
+            raise HTTPException(
+                status_code=400,
+                detail="이미지에서 텍스트를 추출하지 못했어요. 더 선명한 이미지를 사용해주세요.",
+            )
+        return conversation
+    
+    return _event_stream_response(
+        _stream_suggestion_events(
+            context=context,
+            conversation_source=conversation_source,
+            num_suggestions=num_suggestions,
+            fresh=fresh,
+            from_ocr=True,
         )
+    )
+
+
+@router.post("/analyze-images", response_model=GenerateResponse)
+async def analyze_images(
+    images: List[UploadFile] = File(...),
+    user_id: UUIDStr = Form(...),
+    profile_id: UUIDStr = Form(...),
+    num_suggestions: int = Form(3),
+    fresh: bool = Form(False),
+    ocr_service: OCRService = Depends(get_ocr_service),
+):
+    """
+    여러 장의 스크린샷(긴 대화) 기반 Rizz 메시지 생성 엔드포인트.
     
-    # Profile이 해당 user의 것인지 검증
-    if profile.user_id != user_id:
+    1. Profile 조회 (소유자 검증, 실패하면 사용량 차감 없이 404)
+    2. 사용량 체크 및 증가 (이미지 개수와 무관하게 1회)
+    3. 모든 이미지를 동시에 OCR (OCR_MAX_CONCURRENCY개까지)
+    4. 업로드 순서대로 텍스트를 이어 붙이고 겹친 줄 제거
+    5. 합쳐진 대화로 LLM 한 번 호출
+    """
+    if not images:
         raise HTTPException(
-            status_code=403,
-            detail="다른 사용자의 프로필은 사용할 수 없어요.",
+            status_code=400,
+            detail="이미지를 한 장 이상 업로드해주세요.",
+        )
+    if len(images) > MAX_IMAGES_PER_REQUEST:
+        raise HTTPException(
+            status_code=400,
+            detail=f"이미지는 한 번에 최대 {MAX_IMAGES_PER_REQUEST}장까지 업로드할 수 있어요.",
         )
     
-    # 4) 임시 디렉토리 생성
-    temp_dir = Path("temp_images")
-    temp_dir.mkdir(exist_ok=True)
-    
-    # 5) 임시 파일 저장
-    file_id = str(uuid.uuid4())
-    file_extension = Path(image.filename or "image.jpg").suffix or ".jpg"
-    file_path = temp_dir / f"{file_id}{file_extension}"
+    # 1) Profile 조회 (소유자 검증 포함) + 사용량 체크 및 증가 → 여기서 DB 커넥션 반납
+    context = await load_rizz_context(user_id, profile_id)
     
     try:
-        # 파일 저장
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await image.read()
-            await f.write(content)
+        # 4) 업로드 버퍼 읽기
+        contents = [await image.read() for image in images]
+        formats = [
+            normalize_image_format(image.filename, image.content_type)
+            for image in images
+        ]
         
-        logger.info(f"Image saved to {file_path}, size: {len(content)} bytes")
+        logger.info(
+            f"Images received: count={len(contents)}, "
+            f"total size: {sum(len(c) for c in contents)} bytes"
+        )
         
-        # 6) OCR 실행
-        ocr_service = NaverOCRService(
-            secret_key=NAVER_OCR_SECRET_KEY,
-            invoke_url=NAVER_OCR_INVOKE_URL
+        # 5) OCR 동시 실행 (동시 호출 수 제한)
+        semaphore = asyncio.Semaphore(OCR_MAX_CONCURRENCY)
+        
+        async def _ocr(content: bytes, image_format: str) -> str:
+            async with semaphore:
+                return await ocr_service.extract_text_from_bytes(content, image_format)
+        
+        texts = await asyncio.gather(
+            *(_ocr(content, image_format) for content, image_format in zip(contents, formats))
         )
-        conversation = await ocr_service.extract_text(file_path)
         
-        logger.info(f"Extracted text length: {len(conversation)} characters")
-        logger.info(f"Extracted text preview: {conversation[:100]}...")
+        # 6) 순서대로 이어 붙이기 (스크롤 겹침 제거)
+        conversation = merge_ocr_texts(list(texts))
+        
+        logger.info(f"Merged text length: {len(conversation)} characters")
         
-        # 텍스트 추출 검증
         if not conversation or len(conversation.strip()) < 5:
             raise HTTPException(
                 status_code=400,
                 detail="이미지에서 텍스트를 추출하지 못했어요. 더 선명한 이미지를 사용해주세요.",
             )
         
-        # 7) LLM 답변 생성
+        # 7) LLM 답변 생성 (한 번만)
         suggestions = await generate_suggestions_from_conversation(
             conversation=conversation,
-            profile=profile,
+            context=context,
             num_suggestions=num_suggestions,
-            is_premium=is_premium,
+            fresh=fresh,
+            speaker_tagged=is_speaker_tagged(conversation),
         )
         
         if not suggestions:
@@ -170,24 +393,27 @@ async def analyze_image(
                 detail="메시지를 생성하지 못했어요. 다시 한 번 시도해볼래요?",
             )
         
+        record_message_history(user_id, conversation, suggestions)
+        
         return GenerateResponse(
             suggestions=suggestions,
-            usage_info=usage_info,  # ✅ 추가
+            usage_info=context.usage_info,
         )
         
     except HTTPException:
         raise
+    except LLMQueueTimeoutError as e:
+        logger.warning(f"LLM queue wait exceeded: {e}")
+        raise HTTPException(status_code=503, detail=LLM_BUSY_DETAIL) from e
+    except OCRUnavailableError as e:
+        logger.warning(f"OCR unavailable: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="이미지 인식 서비스가 일시적으로 불안정해요. 잠시 후 다시 시도해주세요.",
+        ) from e
     except Exception as e:
-        logger.exception("Error in analyze_image")
+        logger.exception("Error in analyze_images")
         raise HTTPException(
             status_code=500,
             detail=f"이미지 분석 중 오류가 발생했어요: {str(e)}",
         ) from e
-    finally:
-        # 8) 임시 파일 삭제
-        try:
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Temporary file deleted: {file_path}")
-        except Exception as e:
-            logger.warning(f"Failed to delete temp file {file_path}: {e}")
\ No newline at end of file
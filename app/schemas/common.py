@@ -0,0 +1,22 @@
+# app/schemas/common.py
+"""
+여러 API에서 같이 쓰는 타입
+"""
+from __future__ import annotations
+
+import uuid
+from typing import Annotated
+
+from pydantic import AfterValidator
+
+
+def _normalize_uuid(value: str) -> str:
+    # 대소문자 / 하이픈 유무가 달라도 DB·메모리 캐시 키가 같도록 표준 형식으로 통일
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise ValueError("올바른 UUID 형식이 아니에요.") from None
+
+
+# PK/FK가 Postgres UUID 컬럼이라 형식이 틀린 ID는 DB까지 가기 전에 422로 거름
+UUIDStr = Annotated[str, AfterValidator(_normalize_uuid)]
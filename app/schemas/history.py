@@ -0,0 +1,21 @@
+# app/schemas/history.py
+from __future__ import annotations
+
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+# ========== Response DTOs ==========
+
+class HistoryItemResponse(BaseModel):
+    """생성 기록 한 건"""
+    id: str
+    conversation: str
+    suggestions: list[str]
+    created_at: datetime
+
+
+class HistoryListResponse(BaseModel):
+    """생성 기록 목록 (최신순)"""
+    items: list[HistoryItemResponse]
+    next_cursor: str | None = Field(None, description="다음 페이지 커서 (없으면 마지막 페이지)")
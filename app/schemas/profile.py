@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Annotated
 from pydantic import BaseModel, Field
 
+from app.schemas.common import UUIDStr
+
 
 # ========== Request DTOs ==========
 
 class ProfileCreateRequest(BaseModel):
     """프로필 생성 요청"""
-    user_id: str = Field(..., description="프로필을 생성할 사용자 ID")
+    user_id: UUIDStr = Field(..., description="프로필을 생성할 사용자 ID")
     name: str = Field(..., min_length=1, max_length=100, description="프로필 이름")
     age: int | None = Field(None, ge=1, le=150, description="나이")
     gender: str | None = Field(None, max_length=10, description="성별 (예: 남성, 여성, etc)")
@@ -26,21 +29,29 @@ class ProfileUpdateRequest(BaseModel):
 
 # ========== Response DTOs ==========
 
-class ProfileResponse(BaseModel):
-    """프로필 응답"""
+class ProfileSummaryResponse(BaseModel):
+    """프로필 요약 응답 (memo 제외, 목록 summary 모드)"""
     id: str
     user_id: str
     name: str
     age: int | None
     gender: str | None
-    memo: str | None
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True  # SQLAlchemy 모델을 Pydantic으로 변환 가능
+        from_attributes = True  # SQLAlchemy 모델/Row를 Pydantic으로 변환 가능
+
+
+class ProfileResponse(ProfileSummaryResponse):
+    """프로필 응답"""
+    memo: str | None
 
 
 class ProfileListResponse(BaseModel):
-    """프로필 목록 응답"""
-    profiles: list[ProfileResponse]
\ No newline at end of file
+    """프로필 목록 응답 (최신순, 커서 페이지네이션)"""
+    # memo가 있으면 ProfileResponse, 없으면(summary) ProfileSummaryResponse
+    profiles: list[
+        Annotated[ProfileResponse | ProfileSummaryResponse, Field(union_mode="left_to_right")]
+    ]
+    next_cursor: str | None = Field(None, description="다음 페이지 커서 (없으면 마지막 페이지)")
\ No newline at end of file
@@ -6,6 +6,8 @@ from __future__ import annotations
 from typing import List, Literal
 from pydantic import BaseModel, Field
 
+from app.schemas.common import UUIDStr
+
 # ========== Request DTOs ==========
 
 class GenerateRequest(BaseModel):
@@ -17,12 +19,14 @@ class GenerateRequest(BaseModel):
     style: str = "banmal"
     tone: str = "friendly"
     num_suggestions: int = 3
-    user_id: str
+    user_id: UUIDStr
+    profile_id: UUIDStr | None = None  # 있으면 상대방 프로필 정보를 프롬프트에 반영
+    fresh: bool = False  # True면 캐시된 답장 대신 새로 생성
 
 class ImageAnalyzeRequest(BaseModel):
     """이미지 기반 답변 생성 요청 (Profile 활용)"""
-    user_id: str = Field(..., description="사용자 ID")
-    profile_id: str = Field(..., description="상대방 프로필 ID")
+    user_id: UUIDStr = Field(..., description="사용자 ID")
+    profile_id: UUIDStr = Field(..., description="상대방 프로필 ID")
     num_suggestions: int = Field(default=3, ge=1, le=5, description="생성할 답장 개수")
 
 # ========== Response DTOs ==========
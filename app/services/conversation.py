@@ -0,0 +1,50 @@
+# app/services/conversation.py
+"""
+여러 장의 스크린샷에서 추출한 대화 텍스트 이어 붙이기
+"""
+from __future__ import annotations
+
+import re
+
+# 이 글자 수 이상 겹쳐야 중복으로 판단 ("ㅋㅋ" 한 줄 같은 우연한 일치 방지)
+MIN_OVERLAP_CHARS = 8
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_line(line: str) -> str:
+    # OCR은 같은 줄도 띄어쓰기를 다르게 읽는 경우가 많아서 공백을 모두 제거해 비교
+    return _WHITESPACE_RE.sub("", line)
+
+
+def _overlap_size(previous: list[str], current: list[str]) -> int:
+    """
+    previous의 끝부분과 current의 앞부분이 겹치는 최대 줄 수.
+    """
+    max_k = min(len(previous), len(current))
+    for k in range(max_k, 0, -1):
+        if previous[-k:] == current[:k]:
+            if sum(len(line) for line in current[:k]) >= MIN_OVERLAP_CHARS:
+                return k
+    return 0
+
+
+def merge_ocr_texts(texts: list[str]) -> str:
+    """
+    스크린샷 순서대로 OCR 텍스트를 이어 붙인다.
+
+    - 연속된 두 스크린샷에서 앞 장의 마지막 줄들과 뒷 장의 첫 줄들이 같으면
+      (스크롤하며 찍어서 겹친 부분) 한 번만 남긴다.
+    """
+    merged: list[str] = []
+    merged_normalized: list[str] = []
+
+    for text in texts:
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        normalized = [_normalize_line(line) for line in lines]
+
+        skip = _overlap_size(merged_normalized, normalized)
+        merged.extend(lines[skip:])
+        merged_normalized.extend(normalized[skip:])
+
+    return "\n".join(merged)
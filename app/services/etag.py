@@ -0,0 +1,47 @@
+# app/services/etag.py
+"""
+조건부 GET (ETag / If-None-Match → 304) 헬퍼
+
+ETag는 응답 본문이 아니라 버전 값(updated_at / expires_at / 개수 등)으로 만든다.
+→ 버전만 가볍게 조회해서 같으면 본문 조회·직렬화 없이 304.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+
+from fastapi import Response
+
+# 클라이언트가 캐시해도 되지만 쓰기 전에 항상 다시 확인(If-None-Match)하도록
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """버전 값들로 강한(strong) ETag 생성. (따옴표 포함)"""
+    raw = "|".join(
+        part.isoformat() if isinstance(part, datetime) else str(part)
+        for part in parts
+    )
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 맞는지 (여러 값 / * / W/ 접두어 허용, RFC 9110 약한 비교)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """본문 없는 304 응답."""
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,50 @@
+# app/services/http.py
+"""
+외부 API 호출용 공용 httpx AsyncClient 팩토리
+"""
+from __future__ import annotations
+
+import logging
+
+import httpx
+
+logger = logging.getLogger("syrano")
+
+
+def _http2_available() -> bool:
+    """HTTP/2 사용에 필요한 h2 패키지가 설치되어 있는지 확인."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_async_client(
+    *,
+    timeout: float,
+    connect_timeout: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry: float,
+    http2: bool = False,
+) -> httpx.AsyncClient:
+    """
+    keep-alive 커넥션 풀을 가진 AsyncClient 생성.
+
+    - 앱 시작 시 한 번 만들고 종료 시 aclose() 해야 함
+    - http2=True 인데 h2 패키지가 없으면 HTTP/1.1 keep-alive로 동작
+    """
+    if http2 and not _http2_available():
+        logger.warning("h2 package is not installed, falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+    )
@@ -1,58 +1,495 @@
-from typing import List
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import re
+import time
+from collections import deque
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, List
 
+import httpx
 from langchain_openai import ChatOpenAI
 
 from app.config import (
     OPENAI_API_KEY,
     OPENAI_STANDARD_MODEL,
     OPENAI_PREMIUM_MODEL,
+    OPENAI_TIMEOUT,
+    OPENAI_CONNECT_TIMEOUT,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    OPENAI_KEEPALIVE_EXPIRY,
+    OPENAI_MAX_RETRIES,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_STANDARD_MAX_CONCURRENCY,
+    LLM_STANDARD_RPM,
+    LLM_STANDARD_TPM,
+    LLM_PREMIUM_MAX_CONCURRENCY,
+    LLM_PREMIUM_RPM,
+    LLM_PREMIUM_TPM,
+    LLM_MAX_QUEUE_WAIT,
 )
-from app.models.profile import Profile
+from app.services.rizz_context import ProfileContext, RizzContext
 from app.prompts.rizz import build_system_prompt, build_user_prompt
+from app.services.cache import TTLCache
+from app.services.http import create_async_client
+from app.services.metrics import register_metrics
+from app.services.singleflight import SingleFlight
 
+LLM_TEMPERATURE = 0.8
 
-def get_llm(is_premium: bool = False) -> ChatOpenAI:
+# (model, temperature) → 앱 수명 동안 재사용하는 ChatOpenAI
+_llm_clients: dict[tuple[str, float], ChatOpenAI] = {}
+# 모든 ChatOpenAI가 공유하는 OpenAI 커넥션 풀
+_http_client: httpx.AsyncClient | None = None
+
+# 정규화된 프롬프트 해시 → 생성된 답장 목록
+_suggestion_cache: TTLCache[str, tuple[str, ...]] = TTLCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+)
+register_metrics("llm_cache", _suggestion_cache.stats)
+
+# (캐시 키, fresh) → 진행 중인 LLM 호출 (같은 입력의 동시 요청은 한 번만 호출)
+_suggestion_flights: SingleFlight[tuple[str, bool], tuple[str, ...]] = SingleFlight()
+register_metrics("llm_singleflight", _suggestion_flights.stats)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 출력 토큰 추정치 (답장 한 줄당)
+ESTIMATED_TOKENS_PER_SUGGESTION = 60
+
+
+class LLMQueueTimeoutError(Exception):
+    """스케줄러 대기열에서 LLM_MAX_QUEUE_WAIT 안에 차례가 오지 않음 → 503"""
+
+
+class TokenBucket:
     """
-    프리미엄 여부에 따라 사용할 모델을 선택.
+    분당 rate_per_minute만큼 채워지는 토큰 버킷 (용량 = 1분치).
+    rate_per_minute <= 0 이면 제한 없음.
     """
-    model_name = OPENAI_PREMIUM_MODEL if is_premium else OPENAI_STANDARD_MODEL
 
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def wait_time(self, amount: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간(초). 지금 가능하면 0."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        if self.unlimited:
+            return
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated_at) * self.refill_per_second,
+        )
+        self._updated_at = now
+
+
+class LLMScheduler:
+    """
+    모델 하나에 대한 LLM 호출 스케줄러.
+
+    - 동시 호출 수 max_concurrency 제한
+    - 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+    - 우선순위 대기열: 프리미엄 먼저, 같은 등급은 도착 순
+      (스케줄러는 모델별이라 두 등급이 같은 모델을 쓸 때만 의미 있음.
+       기본 설정처럼 모델이 다르면 대기열마다 한 등급만 있어서 도착 순과 같음)
+    - max_queue_wait 안에 차례가 오지 않으면 LLMQueueTimeoutError
+    """
+
+    PREMIUM = 0
+    STANDARD = 1
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        max_concurrency: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_queue_wait: float,
+    ):
+        self.model_name = model_name
+        self.max_concurrency = max_concurrency
+        self.max_queue_wait = max_queue_wait
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+        # [priority, seq, estimated_tokens, waiter]
+        self._queue: list[list] = []
+        self._seq = itertools.count()
+        self._waiting = 0
+        self._active = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+        self.acquired = 0
+        self.timeouts = 0
+        self._waits: deque[float] = deque(maxlen=500)
+
+    @asynccontextmanager
+    async def slot(self, *, is_premium: bool, estimated_tokens: int) -> AsyncIterator[None]:
+        """차례가 올 때까지 기다렸다가 호출이 끝날 때까지 슬롯 하나를 점유."""
+        await self.acquire(is_premium=is_premium, estimated_tokens=estimated_tokens)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, *, is_premium: bool, estimated_tokens: int) -> None:
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        priority = self.PREMIUM if is_premium else self.STANDARD
+        heapq.heappush(self._queue, [priority, next(self._seq), estimated_tokens, waiter])
+        self._waiting += 1
+        started = time.monotonic()
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_queue_wait)
+        except TimeoutError:
+            if self._abandon(waiter):
+                self.timeouts += 1
+                raise LLMQueueTimeoutError(
+                    f"LLM queue wait exceeded {self.max_queue_wait}s ({self.model_name})"
+                ) from None
+            # 타임아웃과 동시에 차례가 온 경우 → 그대로 진행
+        except asyncio.CancelledError:
+            if not self._abandon(waiter):
+                self.release()
+            raise
+
+        self._waits.append(time.monotonic() - started)
+
+    def release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "queue_depth": self._waiting,
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "acquired": self.acquired,
+            "queue_timeouts": self.timeouts,
+            "wait_avg_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "wait_p95_seconds": round(waits[math.ceil(len(waits) * 0.95) - 1], 3) if waits else 0.0,
+            "wait_max_seconds": round(waits[-1], 3) if waits else 0.0,
+            "rpm_available": None if self.requests.unlimited else int(self.requests.tokens),
+            "tpm_available": None if self.tokens.unlimited else int(self.tokens.tokens),
+        }
+
+    def _abandon(self, waiter: asyncio.Future[None]) -> bool:
+        """대기 포기. 이미 차례를 받은 뒤라면 False."""
+        if waiter.done():
+            return False
+        waiter.cancel()
+        self._waiting -= 1
+        return True
+
+    def _dispatch(self) -> None:
+        """대기열 앞에서부터 동시성/레이트 한도 안에서 차례를 넘겨줌."""
+        while self._queue and self._active < self.max_concurrency:
+            _, _, estimated_tokens, waiter = self._queue[0]
+            if waiter.done():
+                # 타임아웃/취소로 포기한 항목
+                heapq.heappop(self._queue)
+                continue
+
+            delay = max(
+                self.requests.wait_time(1),
+                self.tokens.wait_time(estimated_tokens),
+            )
+            if delay > 0:
+                self._schedule_wakeup(delay)
+                return
+
+            heapq.heappop(self._queue)
+            self.requests.consume(1)
+            self.tokens.consume(estimated_tokens)
+            self._waiting -= 1
+            self._active += 1
+            self.acquired += 1
+            waiter.set_result(None)
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        if self._wakeup is not None and not self._wakeup.cancelled():
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+
+# 모델명 → 스케줄러 (두 등급이 같은 모델을 쓰면 대기열도 하나라 프리미엄이 먼저 나감)
+_schedulers: dict[str, LLMScheduler] = {}
+
+
+def get_scheduler(model_name: str) -> LLMScheduler:
+    scheduler = _schedulers.get(model_name)
+    if scheduler is None:
+        is_premium_model = model_name == OPENAI_PREMIUM_MODEL
+        scheduler = _schedulers[model_name] = LLMScheduler(
+            model_name,
+            max_concurrency=(
+                LLM_PREMIUM_MAX_CONCURRENCY if is_premium_model else LLM_STANDARD_MAX_CONCURRENCY
+            ),
+            requests_per_minute=LLM_PREMIUM_RPM if is_premium_model else LLM_STANDARD_RPM,
+            tokens_per_minute=LLM_PREMIUM_TPM if is_premium_model else LLM_STANDARD_TPM,
+            max_queue_wait=LLM_MAX_QUEUE_WAIT,
+        )
+    return scheduler
+
+
+register_metrics(
+    "llm_scheduler",
+    lambda: {model_name: s.stats() for model_name, s in _schedulers.items()},
+)
+
+
+def _estimate_tokens(messages: list[dict], num_suggestions: int) -> int:
+    # 한국어 위주 프롬프트라 대략 2글자당 1토큰 + 출력 추정치
+    prompt_chars = sum(len(m["content"]) for m in messages)
+    return prompt_chars // 2 + num_suggestions * ESTIMATED_TOKENS_PER_SUGGESTION
+
+
+def _build_llm(model_name: str, temperature: float) -> ChatOpenAI:
     return ChatOpenAI(
         model=model_name,
-        temperature=0.8,
+        temperature=temperature,
         api_key=OPENAI_API_KEY,
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_async_client=_http_client,
     )
 
 
-async def generate_suggestions_from_conversation(
-    *,
-    conversation: str,
-    profile: Profile,
-    num_suggestions: int = 3,
-    is_premium: bool = False,
-) -> List[str]:
+def init_llm_clients() -> None:
     """
-    대화 캡처(텍스트) + 상대방 프로필 정보를 기반으로 답장 후보들을 생성.
+    앱 시작 시 OpenAI 커넥션 풀과 모델별 ChatOpenAI를 한 번만 생성.
     """
-    llm = get_llm(is_premium=is_premium)
-    
+    global _http_client
+
+    _http_client = create_async_client(
+        timeout=OPENAI_TIMEOUT,
+        connect_timeout=OPENAI_CONNECT_TIMEOUT,
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+    _llm_clients.clear()
+    for model_name in (OPENAI_STANDARD_MODEL, OPENAI_PREMIUM_MODEL):
+        _llm_clients[(model_name, LLM_TEMPERATURE)] = _build_llm(model_name, LLM_TEMPERATURE)
+
+
+async def close_llm_clients() -> None:
+    """
+    앱 종료 시 ChatOpenAI 캐시 비우고 커넥션 풀 정리.
+    """
+    global _http_client
+
+    _llm_clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def get_llm(is_premium: bool = False) -> ChatOpenAI:
+    """
+    프리미엄 여부에 따라 사용할 모델을 선택.
+
+    - lifespan에서 만든 클라이언트를 재사용
+    - 초기화 전(스크립트 등)이면 처음 호출 시 만들어서 캐시
+    """
+    model_name = OPENAI_PREMIUM_MODEL if is_premium else OPENAI_STANDARD_MODEL
+    key = (model_name, LLM_TEMPERATURE)
+
+    llm = _llm_clients.get(key)
+    if llm is None:
+        llm = _llm_clients[key] = _build_llm(model_name, LLM_TEMPERATURE)
+    return llm
+
+
+def _build_messages(
+    conversation: str,
+    profile: ProfileContext | None,
+    num_suggestions: int,
+    speaker_tagged: bool = False,
+) -> list[dict]:
     # 프롬프트는 prompts 모듈에서 가져옴
     system_msg = build_system_prompt()
     user_msg = build_user_prompt(
         conversation=conversation,
         profile=profile,
         num_suggestions=num_suggestions,
+        speaker_tagged=speaker_tagged,
     )
     
-    messages = [
+    return [
         {"role": "system", "content": system_msg},
         {"role": "user", "content": user_msg},
     ]
 
-    response = await llm.ainvoke(messages)
 
-    # 줄바꿈으로 분리
-    lines = [line.strip() for line in response.content.split("\n") if line.strip()]
+def _normalize_prompt(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _suggestion_cache_key(
+    model_name: str,
+    messages: list[dict],
+    profile: ProfileContext | None,
+) -> str:
+    """
+    정규화한 system/user 프롬프트 + 모델명 + 프로필 버전(updated_at) 해시.
+    프로필이 수정되면 updated_at이 바뀌어 이전 캐시는 자연스럽게 무효화됨.
+    """
+    payload = {
+        "model": model_name,
+        "messages": [_normalize_prompt(m["content"]) for m in messages],
+        "profile_id": profile.id if profile is not None else None,
+        "profile_version": (
+            profile.updated_at.isoformat()
+            if profile is not None and profile.updated_at is not None
+            else None
+        ),
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def generate_suggestions_from_conversation(
+    *,
+    conversation: str,
+    context: RizzContext,
+    num_suggestions: int = 3,
+    fresh: bool = False,
+    speaker_tagged: bool = False,
+) -> List[str]:
+    """
+    대화 캡처(텍스트) + 상대방 프로필 정보(context.profile)를 기반으로 답장 후보들을 생성.
+    (모델은 context.is_premium으로 선택)
+
+    - 같은 입력이면 캐시된 답장을 재사용 (LLM 호출 생략)
+    - fresh=True면 캐시를 건너뛰고 새로 생성 (결과는 캐시에 갱신)
+    - 같은 입력의 호출이 진행 중이면 새로 호출하지 않고 그 결과를 공유
+    - speaker_tagged=True면 "나:" / "상대:" 화자 태그 설명을 프롬프트에 포함 (OCR 레이아웃 인코더 결과)
+    """
+    is_premium = context.is_premium
+    llm = get_llm(is_premium=is_premium)
+    messages = _build_messages(conversation, context.profile, num_suggestions, speaker_tagged)
+
+    cache_key = _suggestion_cache_key(llm.model_name, messages, context.profile)
+    if LLM_CACHE_ENABLED and not fresh:
+        cached = _suggestion_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+    scheduler = get_scheduler(llm.model_name)
+    estimated_tokens = _estimate_tokens(messages, num_suggestions)
+
+    async def _invoke() -> tuple[str, ...]:
+        async with scheduler.slot(is_premium=is_premium, estimated_tokens=estimated_tokens):
+            response = await llm.ainvoke(messages)
+
+        # 줄바꿈으로 분리
+        lines = [line.strip() for line in response.content.split("\n") if line.strip()]
+
+        # 요청한 개수만큼 자르기
+        suggestions = tuple(lines[:num_suggestions])
+
+        if LLM_CACHE_ENABLED and suggestions:
+            _suggestion_cache.set(cache_key, suggestions)
+        return suggestions
+
+    # 같은 입력으로 진행 중인 호출이 있으면 그 결과를 함께 기다림
+    return list(await _suggestion_flights.do((cache_key, fresh), _invoke))
+
+
+async def stream_suggestions_from_conversation(
+    *,
+    conversation: str,
+    context: RizzContext,
+    num_suggestions: int = 3,
+    fresh: bool = False,
+    speaker_tagged: bool = False,
+) -> AsyncIterator[str]:
+    """
+    generate_suggestions_from_conversation의 스트리밍 버전.
+    토큰을 받는 대로 이어 붙이다가 한 줄(답장 하나)이 완성될 때마다 바로 yield.
+    (캐시 히트면 캐시된 답장을 바로 yield, 끝까지 받은 결과만 캐시에 저장)
+    (스트림 자체는 토큰 단위라 합치지 않고, 진행 중인 일반 생성 호출에만 합류)
+    """
+    is_premium = context.is_premium
+    llm = get_llm(is_premium=is_premium)
+    messages = _build_messages(conversation, context.profile, num_suggestions, speaker_tagged)
+
+    cache_key = _suggestion_cache_key(llm.model_name, messages, context.profile)
+    if LLM_CACHE_ENABLED and not fresh:
+        cached = _suggestion_cache.get(cache_key)
+        if cached is not None:
+            for suggestion in cached:
+                yield suggestion
+            return
+
+    # 같은 입력의 일반 생성 호출이 진행 중이면 그 결과를 받아서 전달
+    in_flight = _suggestion_flights.join((cache_key, fresh))
+    if in_flight is not None:
+        for suggestion in await in_flight:
+            yield suggestion
+        return
+
+    suggestions: list[str] = []
+    buffer = ""
+    scheduler = get_scheduler(llm.model_name)
+    estimated_tokens = _estimate_tokens(messages, num_suggestions)
+
+    # 스트림이 끝날 때까지 슬롯 점유
+    # aclosing: 필요한 줄 수를 채워 break하거나 클라이언트가 끊겨 이 제너레이터가 닫히면
+    # OpenAI 스트림도 바로 닫아서 슬롯을 오래 잡지 않음
+    async with scheduler.slot(is_premium=is_premium, estimated_tokens=estimated_tokens):
+        async with aclosing(llm.astream(messages)) as stream:
+            async for chunk in stream:
+                if not isinstance(chunk.content, str):
+                    continue
+                buffer += chunk.content
+
+                while "\n" in buffer and len(suggestions) < num_suggestions:
+                    line, buffer = buffer.split("\n", 1)
+                    line = line.strip()
+                    if not line:
+                        continue
+                    suggestions.append(line)
+                    yield line
+
+                if len(suggestions) >= num_suggestions:
+                    break
+            else:
+                # 마지막 줄은 줄바꿈 없이 끝날 수 있음
+                if buffer.strip() and len(suggestions) < num_suggestions:
+                    suggestions.append(buffer.strip())
+                    yield buffer.strip()
 
-    # 요청한 개수만큼 자르기
-    return lines[:num_suggestions]
\ No newline at end of file
+    if LLM_CACHE_ENABLED and suggestions:
+        _suggestion_cache.set(cache_key, tuple(suggestions))
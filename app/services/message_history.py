@@ -0,0 +1,487 @@
+# app/services/message_history.py
+"""
+생성 기록(message_history) 비동기 저장 (write-behind)
+
+요청 처리 중에는 메모리 큐에 넣기만 하고(DB 왕복 없음),
+백그라운드 태스크가 모아서 한 번에 INSERT (executemany).
+
+- 큐가 가득 차면 기다리지 않고 버림 (응답 지연보다 기록 유실을 택함) → dropped 지표
+- 종료 시 큐에 남은 기록까지 모두 저장
+
+테이블은 created_at 기준 월별 파티션 (migrations 0004).
+유지보수 태스크가 다음 달 파티션을 미리 만들고(DEFAULT 파티션에 들어간 그 달 행은 옮김),
+보관 기간이 지난 파티션은 행 단위 DELETE 대신 DETACH + DROP으로 통째로 삭제.
+DEFAULT 파티션의 만료 행만 배치 DELETE.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import (
+    MESSAGE_HISTORY_ENABLED,
+    MESSAGE_HISTORY_QUEUE_SIZE,
+    MESSAGE_HISTORY_BATCH_SIZE,
+    MESSAGE_HISTORY_FLUSH_INTERVAL,
+    MESSAGE_HISTORY_RETENTION_MONTHS,
+    MESSAGE_HISTORY_PARTITIONS_AHEAD,
+    MESSAGE_HISTORY_MAINTENANCE_INTERVAL,
+)
+from app.models import MessageHistory
+from app.models.base import generate_uuid
+from app.services.metrics import register_metrics
+from app.services.pagination import after_cursor, encode_cursor
+
+logger = logging.getLogger("syrano")
+
+_INSERT_STMT = insert(MessageHistory.__table__)
+
+
+class MessageHistoryWriter:
+    """
+    bounded queue + 일괄 INSERT.
+
+    배치는 batch_size개가 모이거나 첫 기록 이후 flush_interval초가 지나면 저장.
+    """
+
+    # 큐가 가득 찼을 때 경고 로그 간격 (건)
+    DROP_LOG_EVERY = 100
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=max(1, max_queue))
+        self._task: asyncio.Task[None] | None = None
+        self._collecting: list[dict[str, Any]] = []
+        self._writing: asyncio.Future[None] | None = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.write_failures = 0
+        self.failed_rows = 0
+        self.last_batch_seconds = 0.0
+
+    def record(self, user_id: str, conversation: str, suggestions: list[str]) -> None:
+        """생성 결과 한 건을 큐에 넣음 (블로킹 없음, 가득 차면 버림)."""
+        row = {
+            "id": generate_uuid(),
+            "user_id": user_id,
+            "conversation": conversation,
+            "suggestions": {"items": suggestions},
+            # 저장 시점이 아니라 생성 시점
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % self.DROP_LOG_EVERY == 1:
+                logger.warning(f"Message history queue full, dropped {self.dropped} records so far")
+            return
+        self.enqueued += 1
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 저장 중이던 배치는 끝까지 기다리고, 모으던 배치와 큐에 남은 기록도 저장
+        if self._writing is not None:
+            await self._writing
+        if self._collecting:
+            batch, self._collecting = self._collecting, []
+            await self._write(batch)
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait() for _ in range(min(self.batch_size, self._queue.qsize()))]
+            await self._write(batch)
+
+    def stats(self) -> dict:
+        return {
+            "queue_size": self._queue.qsize() + len(self._collecting),
+            "queue_capacity": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "write_failures": self.write_failures,
+            "failed_rows": self.failed_rows,
+            "last_batch_seconds": self.last_batch_seconds,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # 모으는 중인 배치는 self._collecting에 둠 → 종료(cancel) 시 close()가 이어서 저장
+            self._collecting = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(self._collecting) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._collecting.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            batch, self._collecting = self._collecting, []
+            # 저장 중에 cancel돼도 이미 꺼낸 배치는 끝까지 저장
+            self._writing = asyncio.ensure_future(self._write(batch))
+            try:
+                await asyncio.shield(self._writing)
+            finally:
+                if self._writing.done():
+                    self._writing = None
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        started = time.monotonic()
+        try:
+            async with self.session_factory() as session:
+                await session.execute(_INSERT_STMT, batch)
+                await session.commit()
+        except Exception:
+            # 재시도하지 않음 (삭제된 유저 FK 위반 등은 다시 해도 실패)
+            logger.exception(f"Failed to write message history ({len(batch)} records)")
+            self.write_failures += 1
+            self.failed_rows += len(batch)
+            return
+        self.batches += 1
+        self.written += len(batch)
+        self.last_batch_seconds = round(time.monotonic() - started, 4)
+
+
+# 앱 수명 동안 쓰는 writer (lifespan 전 / 스크립트 / 비활성화 시 None → 기록 안 함)
+_writer: MessageHistoryWriter | None = None
+
+
+def record_message_history(user_id: str, conversation: str, suggestions: list[str]) -> None:
+    """생성 기록 저장 예약 (응답 경로에서 호출, DB 대기 없음)."""
+    if _writer is not None:
+        _writer.record(user_id, conversation, suggestions)
+
+
+async def init_message_history_writer() -> None:
+    """앱 시작 시 writer 생성 + 백그라운드 저장 시작."""
+    global _writer
+
+    if not MESSAGE_HISTORY_ENABLED:
+        return
+
+    from app.db import AsyncSessionLocal
+
+    _writer = MessageHistoryWriter(
+        AsyncSessionLocal,
+        max_queue=MESSAGE_HISTORY_QUEUE_SIZE,
+        batch_size=MESSAGE_HISTORY_BATCH_SIZE,
+        flush_interval=MESSAGE_HISTORY_FLUSH_INTERVAL,
+    )
+    register_metrics("message_history", _writer.stats)
+    await _writer.start()
+
+
+async def close_message_history_writer() -> None:
+    """앱 종료 시 남은 기록 저장."""
+    global _writer
+
+    if _writer is not None:
+        await _writer.close()
+        _writer = None
+
+
+async def get_message_history_page(
+    session: AsyncSession,
+    user_id: str,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[MessageHistory], str | None]:
+    """
+    유저의 생성 기록을 최신순으로 limit개 + 다음 페이지 커서 반환.
+    ix_message_history_user_id_created_at 인덱스에서 커서 위치부터 읽으므로
+    몇 번째 페이지든 limit개만 읽음.
+    """
+    query = (
+        select(MessageHistory)
+        .where(MessageHistory.user_id == user_id)
+        .order_by(MessageHistory.created_at.desc(), MessageHistory.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(after_cursor(MessageHistory.created_at, MessageHistory.id, cursor))
+
+    rows = list((await session.execute(query)).scalars())
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+# ========== 파티션 유지보수 ==========
+
+_PARTITION_PREFIX = "message_history_p"
+_PARTITION_NAME = re.compile(rf"^{_PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+_DEFAULT_PARTITION = "message_history_default"
+# 여러 프로세스가 동시에 DDL을 돌리지 않도록 하는 advisory lock 키
+_MAINTENANCE_LOCK_KEY = 0x5E7A_0001
+# DEFAULT 파티션 만료 행 삭제: 한 번에 지우는 행 수 / 한 번 실행에서 돌리는 최대 배치 수
+_DEFAULT_PURGE_BATCH_SIZE = 5000
+_DEFAULT_PURGE_MAX_BATCHES = 20
+
+_maintenance_task: asyncio.Task[None] | None = None
+_maintenance_stats = {
+    "runs": 0,
+    "skipped": 0,
+    "created": 0,
+    "dropped": 0,
+    "moved_from_default": 0,
+    "purged_from_default": 0,
+    "failures": 0,
+}
+register_metrics("message_history_partitions", lambda: dict(_maintenance_stats))
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month: date) -> str:
+    return f"{_PARTITION_PREFIX}{month:%Y%m}"
+
+
+def _retention_cutoff(retention_months: int) -> date:
+    """이 날짜(UTC 월 시작)보다 이전 기록은 보관 기간이 지난 것."""
+    return _add_months(datetime.now(timezone.utc).date().replace(day=1), -retention_months)
+
+
+def _month_start(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+async def _try_maintenance_lock(session: AsyncSession) -> bool:
+    locked = await session.scalar(
+        text("SELECT pg_try_advisory_xact_lock(:key)"),
+        {"key": _MAINTENANCE_LOCK_KEY},
+    )
+    if not locked:
+        await session.rollback()
+    return bool(locked)
+
+
+async def create_history_partition(session: AsyncSession, month: date) -> int | None:
+    """
+    month의 파티션 생성 (이미 있으면 None). DEFAULT 파티션에서 옮긴 행 수 반환.
+
+    DEFAULT 파티션에 그 달 행이 있으면 PARTITION OF로 바로 만들 수 없으므로
+    따로 테이블을 만들고 → DEFAULT에서 그 달 행을 옮긴 뒤 → ATTACH.
+    (호출한 쪽에서 commit, 실패하면 이 달만 롤백)
+    """
+    name = _partition_name(month)
+    if await session.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is not None:
+        return None
+
+    # 경계는 UTC 월 시작 (이름/값 모두 날짜에서 만든 값이라 그대로 넣어도 안전)
+    bounds = f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{_add_months(month, 1)} 00:00:00+00')"
+
+    if await session.scalar(text("SELECT to_regclass(:name)"), {"name": _DEFAULT_PARTITION}) is None:
+        await session.execute(text(f"CREATE TABLE {name} PARTITION OF message_history {bounds}"))
+        return 0
+
+    # ATTACH가 어차피 DEFAULT에 ACCESS EXCLUSIVE를 잡으므로 처음부터 잡아서
+    # 옮기는 동안 새 행이 들어오지 않게 함 (오래 기다리지 않도록 lock_timeout)
+    await session.execute(text("SET LOCAL lock_timeout = '5s'"))
+    await session.execute(text(f"LOCK TABLE {_DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE"))
+    await session.execute(text(
+        f"CREATE TABLE {name} (LIKE message_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    moved = await session.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {_DEFAULT_PARTITION} "
+            f"WHERE created_at >= :lower AND created_at < :upper "
+            f"RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": _month_start(month), "upper": _month_start(_add_months(month, 1))},
+    )
+    # PK / 인덱스 / FK는 ATTACH 시 부모 테이블 것이 붙음
+    await session.execute(text(f"ALTER TABLE message_history ATTACH PARTITION {name} {bounds}"))
+    return moved.rowcount
+
+
+async def drop_expired_history_partitions(session: AsyncSession, retention_months: int) -> list[str]:
+    """
+    이번 달 이전 retention_months개월보다 오래된 월 파티션을 DETACH 후 DROP.
+    (행 단위 DELETE 없이 파일째 삭제 → VACUUM / WAL 부담 없음) 삭제한 파티션 이름 반환.
+    """
+    cutoff = _retention_cutoff(retention_months)
+    dropped = []
+    for name in await _list_partitions(session):
+        match = _PARTITION_NAME.match(name)
+        if match is None:
+            continue  # DEFAULT 파티션 등
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(month, 1) > cutoff:
+            continue
+        await session.execute(text(f"ALTER TABLE message_history DETACH PARTITION {name}"))
+        await session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def purge_expired_default_rows(session: AsyncSession, retention_months: int, limit: int) -> int:
+    """
+    DEFAULT 파티션에서 보관 기간이 지난 행을 최대 limit개 삭제. 삭제한 행 수 반환.
+
+    DEFAULT 파티션은 DROP할 수 없어서 행 단위로 지우되, 한 번에 지우는 양을 제한해
+    긴 트랜잭션 / 큰 WAL 폭증을 막음.
+    """
+    result = await session.execute(
+        text(
+            f"DELETE FROM {_DEFAULT_PARTITION} WHERE ctid IN ("
+            f"SELECT ctid FROM {_DEFAULT_PARTITION} "
+            f"WHERE created_at < :cutoff LIMIT :limit)"
+        ),
+        {"cutoff": _month_start(_retention_cutoff(retention_months)), "limit": limit},
+    )
+    return result.rowcount
+
+
+async def _list_partitions(session: AsyncSession) -> list[str]:
+    result = await session.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'message_history'::regclass ORDER BY c.relname"
+    ))
+    return list(result.scalars())
+
+
+async def run_history_maintenance(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    파티션 유지보수 한 번 실행.
+
+    단계마다 트랜잭션(과 advisory lock)을 따로 잡아서 한 단계가 실패해도 다른 단계는 진행.
+    1) 이번 달 ~ MESSAGE_HISTORY_PARTITIONS_AHEAD개월 뒤 파티션 생성 (달마다 한 트랜잭션)
+    2) 보관 기간 지난 월 파티션 DETACH + DROP
+    3) DEFAULT 파티션의 보관 기간 지난 행을 배치로 삭제 (배치마다 한 트랜잭션)
+    다른 프로세스가 락을 잡고 있으면 그 단계는 건너뜀 (skipped).
+    """
+    _maintenance_stats["runs"] += 1
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+
+    # 1) 파티션 생성
+    for offset in range(MESSAGE_HISTORY_PARTITIONS_AHEAD + 1):
+        month = _add_months(this_month, offset)
+        try:
+            async with session_factory() as session:
+                if not await _try_maintenance_lock(session):
+                    _maintenance_stats["skipped"] += 1
+                    break
+                moved = await create_history_partition(session, month)
+                await session.commit()
+        except Exception:
+            _maintenance_stats["failures"] += 1
+            logger.exception(f"Failed to create message history partition {_partition_name(month)}")
+            continue
+        if moved is not None:
+            _maintenance_stats["created"] += 1
+            _maintenance_stats["moved_from_default"] += moved
+            logger.info(
+                f"Message history partition created: {_partition_name(month)} "
+                f"(moved {moved} rows from {_DEFAULT_PARTITION})"
+            )
+
+    if MESSAGE_HISTORY_RETENTION_MONTHS <= 0:
+        return
+
+    # 2) 만료 파티션 삭제
+    try:
+        async with session_factory() as session:
+            if await _try_maintenance_lock(session):
+                dropped = await drop_expired_history_partitions(session, MESSAGE_HISTORY_RETENTION_MONTHS)
+                await session.commit()
+                _maintenance_stats["dropped"] += len(dropped)
+                if dropped:
+                    logger.info(f"Message history partitions dropped: {dropped}")
+            else:
+                _maintenance_stats["skipped"] += 1
+    except Exception:
+        _maintenance_stats["failures"] += 1
+        logger.exception("Failed to drop expired message history partitions")
+
+    # 3) DEFAULT 파티션 만료 행 삭제 (행 잠금만 잡으므로 advisory lock 불필요)
+    purged = 0
+    try:
+        for _ in range(_DEFAULT_PURGE_MAX_BATCHES):
+            async with session_factory() as session:
+                deleted = await purge_expired_default_rows(
+                    session, MESSAGE_HISTORY_RETENTION_MONTHS, _DEFAULT_PURGE_BATCH_SIZE
+                )
+                await session.commit()
+            purged += deleted
+            if deleted < _DEFAULT_PURGE_BATCH_SIZE:
+                break
+    except Exception:
+        _maintenance_stats["failures"] += 1
+        logger.exception(f"Failed to purge expired rows from {_DEFAULT_PARTITION}")
+    _maintenance_stats["purged_from_default"] += purged
+    if purged:
+        logger.info(f"Message history rows purged from {_DEFAULT_PARTITION}: {purged}")
+
+
+async def _run_history_maintenance(interval: float) -> None:
+    from app.db import AsyncSessionLocal
+
+    while True:
+        try:
+            await run_history_maintenance(AsyncSessionLocal)
+        except Exception:
+            _maintenance_stats["failures"] += 1
+            logger.exception("Message history partition maintenance failed")
+        await asyncio.sleep(interval)
+
+
+def start_history_maintenance() -> None:
+    """
+    앱 시작 시 파티션 유지보수 시작 (MESSAGE_HISTORY_MAINTENANCE_INTERVAL마다 한 번).
+    """
+    global _maintenance_task
+
+    if _maintenance_task is None and MESSAGE_HISTORY_MAINTENANCE_INTERVAL > 0:
+        _maintenance_task = asyncio.create_task(
+            _run_history_maintenance(MESSAGE_HISTORY_MAINTENANCE_INTERVAL)
+        )
+
+
+async def stop_history_maintenance() -> None:
+    global _maintenance_task
+
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+        try:
+            await _maintenance_task
+        except asyncio.CancelledError:
+            pass
+        _maintenance_task = None
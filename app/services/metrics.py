@@ -0,0 +1,26 @@
+# app/services/metrics.py
+"""
+프로세스 내 운영 지표 레지스트리
+
+각 컴포넌트가 stats()를 돌려주는 함수를 등록하고,
+GET /metrics 에서 한 번에 모아서 보여준다.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], dict[str, Any]]) -> None:
+    """이름별 지표 제공 함수 등록 (같은 이름이면 덮어씀)."""
+    _providers[name] = provider
+
+
+def unregister_metrics(name: str) -> None:
+    _providers.pop(name, None)
+
+
+def collect_metrics() -> dict[str, dict[str, Any]]:
+    """등록된 모든 지표 스냅샷."""
+    return {name: provider() for name, provider in _providers.items()}
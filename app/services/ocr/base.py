@@ -1,27 +1,88 @@
 """
 OCR 서비스 인터페이스 (Protocol)
 """
+import asyncio
 from typing import Protocol
 from pathlib import Path
 
 
+class OCRError(Exception):
+    """
+    OCR 처리 실패.
+
+    retryable=True면 타임아웃/5xx처럼 다시 시도해볼 만한 일시적 오류.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class OCRUnavailableError(OCRError):
+    """OCR 백엔드가 불안정해서 빠르게 실패시킨 경우 (서킷 오픈 / 재시도 소진) → 503"""
+
+
 class OCRService(Protocol):
     """
     OCR 서비스 프로토콜.
     이 인터페이스를 따르는 모든 클래스는 OCRService로 사용 가능.
     """
-    
+
     async def extract_text(self, image_path: str | Path) -> str:
         """
         이미지에서 텍스트를 추출합니다.
-        
+
         Args:
             image_path: 이미지 파일 경로
-            
+
+        Returns:
+            추출된 텍스트
+
+        Raises:
+            Exception: OCR 처리 중 오류 발생 시
+        """
+        ...
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        """
+        메모리에 있는 이미지 바이트에서 텍스트를 추출합니다.
+        (업로드 버퍼를 디스크에 쓰지 않고 바로 전달할 때 사용)
+
+        Args:
+            image_data: 이미지 바이트
+            image_format: 이미지 포맷 (jpeg, png 등)
+
         Returns:
             추출된 텍스트
-            
+
         Raises:
             Exception: OCR 처리 중 오류 발생 시
         """
-        ...
\ No newline at end of file
+        ...
+
+
+def normalize_image_format(
+    filename: str | None = None,
+    content_type: str | None = None,
+) -> str:
+    """
+    파일명 확장자 또는 Content-Type으로 OCR API용 포맷 문자열을 결정.
+    (알 수 없으면 jpeg)
+    """
+    image_format = ""
+    if filename:
+        image_format = Path(filename).suffix.lower().lstrip(".")
+    if not image_format and content_type and content_type.startswith("image/"):
+        image_format = content_type.split("/", 1)[1].lower()
+
+    if image_format == "jpg":
+        image_format = "jpeg"
+    return image_format or "jpeg"
+
+
+async def read_image_file(image_path: str | Path) -> tuple[bytes, str]:
+    """
+    이미지 파일을 이벤트 루프를 막지 않고 읽어서 (바이트, 포맷)으로 반환.
+    """
+    image_data = await asyncio.to_thread(Path(image_path).read_bytes)
+    return image_data, normalize_image_format(filename=str(image_path))
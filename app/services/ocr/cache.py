@@ -0,0 +1,207 @@
+# app/services/ocr/cache.py
+"""
+이미지 바이트 해시(SHA-256) 기반 OCR 결과 캐시
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+
+from app.services.cache import TTLCache
+from app.services.ocr.base import OCRService, read_image_file
+
+logger = logging.getLogger("syrano")
+
+# OCR 결과 텍스트 형식이 바뀌면 올려서 예전 캐시를 무효화
+CACHE_FORMAT_VERSION = 1
+
+
+def cache_namespace(**settings: object) -> str:
+    """
+    결과 텍스트에 영향을 주는 설정(레이아웃 인코더, 전처리 옵션 등)으로 캐시 키 접두사 생성.
+
+    설정이나 CACHE_FORMAT_VERSION이 바뀌면 접두사가 달라져 예전 결과(특히 디스크)를 다시 쓰지 않음.
+    """
+    fingerprint = ";".join(f"{name}={settings[name]!r}" for name in sorted(settings))
+    digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:12]
+    return f"v{CACHE_FORMAT_VERSION}-{digest}"
+
+
+class CachedOCRService:
+    """
+    OCRService를 감싸서 같은 이미지의 OCR 결과를 재사용.
+
+    - 1차: 프로세스 내 LRU + TTL (TTLCache)
+    - 2차(선택): disk_dir 아래 {namespace}-{sha256}.txt 파일 (재시작 후에도 유지)
+      - 시작 시, 그리고 disk_sweep_interval마다 또는 disk_max_entries를 넘으면 정리
+        (만료 파일 삭제 → 그래도 많으면 오래된 것부터 삭제)
+    - 둘 다 없을 때만 내부 OCR 호출
+    """
+
+    def __init__(
+        self,
+        inner: OCRService,
+        memory_cache: TTLCache[str, str],
+        disk_dir: str | Path | None = None,
+        disk_ttl_seconds: float | None = None,
+        disk_max_entries: int = 10000,
+        disk_sweep_interval: float = 3600.0,
+        namespace: str = "",
+    ):
+        self.inner = inner
+        self.memory_cache = memory_cache
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_ttl_seconds = (
+            memory_cache.ttl_seconds if disk_ttl_seconds is None else disk_ttl_seconds
+        )
+        self.disk_max_entries = disk_max_entries
+        self.disk_sweep_interval = disk_sweep_interval
+        self.namespace = namespace
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_entries = 0
+        self.disk_evictions = 0
+        self._last_sweep = time.monotonic()
+        self._sweep_task: asyncio.Task | None = None
+
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            # 시작 시 한 번 정리 (이전 실행에서 남은 만료 파일 / 상한 초과분)
+            self.sweep_disk()
+
+    async def extract_text(self, image_path: str | Path) -> str:
+        image_data, image_format = await read_image_file(image_path)
+        return await self.extract_text_from_bytes(image_data, image_format)
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        key = self._cache_key(image_data)
+
+        # 1) 메모리 캐시
+        cached = self.memory_cache.get(key)
+        if cached is not None:
+            logger.info(f"OCR cache hit (memory): {key[-12:]}")
+            return cached
+
+        # 2) 디스크 캐시
+        if self.disk_dir is not None:
+            cached = await asyncio.to_thread(self._read_disk, key)
+            if cached is not None:
+                logger.info(f"OCR cache hit (disk): {key[-12:]}")
+                self.disk_hits += 1
+                self.memory_cache.set(key, cached)
+                return cached
+
+        # 3) 실제 OCR 호출 (실패는 캐시하지 않음)
+        self.misses += 1
+        text = await self.inner.extract_text_from_bytes(image_data, image_format)
+
+        self.memory_cache.set(key, text)
+        if self.disk_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, text)
+            except OSError:
+                logger.warning(f"Failed to write OCR disk cache: {key[-12:]}", exc_info=True)
+            else:
+                self._maybe_schedule_sweep()
+
+        return text
+
+    def stats(self) -> dict:
+        memory = self.memory_cache.stats()
+        total = memory["hits"] + self.disk_hits + self.misses
+        return {
+            "memory": memory,
+            "disk_enabled": self.disk_dir is not None,
+            "disk_hits": self.disk_hits,
+            "disk_entries": self.disk_entries,
+            "disk_evictions": self.disk_evictions,
+            "misses": self.misses,
+            "hit_rate": round((total - self.misses) / total, 4) if total else 0.0,
+        }
+
+    def sweep_disk(self) -> None:
+        """
+        디스크 캐시 정리 (블로킹 I/O, 요청 경로에서는 asyncio.to_thread로 실행).
+
+        - TTL 지난 파일과 쓰다 남은 임시 파일 삭제
+        - 그래도 disk_max_entries를 넘으면 mtime 오래된 순으로 90%까지 삭제
+          (상한 근처에서 쓸 때마다 정리가 돌지 않도록 여유를 둠)
+        """
+        now = time.time()
+        entries: list[tuple[float, Path]] = []
+        removed = 0
+
+        for path in self.disk_dir.iterdir():
+            if path.suffix not in (".txt", ".tmp"):
+                continue
+            try:
+                mtime = path.stat().st_mtime
+                expired = now - mtime >= self.disk_ttl_seconds
+                stale_tmp = path.suffix == ".tmp" and now - mtime >= 60
+                if expired or stale_tmp:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                elif path.suffix == ".txt":
+                    entries.append((mtime, path))
+            except FileNotFoundError:
+                continue
+
+        if len(entries) > self.disk_max_entries:
+            entries.sort()
+            excess = len(entries) - int(self.disk_max_entries * 0.9)
+            for _, path in entries[:excess]:
+                path.unlink(missing_ok=True)
+            removed += excess
+            entries = entries[excess:]
+
+        self.disk_entries = len(entries)
+        self.disk_evictions += removed
+        self._last_sweep = time.monotonic()
+        if removed:
+            logger.info(f"OCR disk cache sweep: removed {removed}, kept {self.disk_entries}")
+
+    def _maybe_schedule_sweep(self) -> None:
+        # 정리는 백그라운드 스레드에서, 한 번에 하나만
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        due = time.monotonic() - self._last_sweep >= self.disk_sweep_interval
+        if self.disk_entries > self.disk_max_entries or due:
+            self._sweep_task = asyncio.create_task(self._sweep_in_background())
+
+    async def _sweep_in_background(self) -> None:
+        try:
+            await asyncio.to_thread(self.sweep_disk)
+        except OSError:
+            logger.warning("OCR disk cache sweep failed", exc_info=True)
+
+    def _cache_key(self, image_data: bytes) -> str:
+        digest = hashlib.sha256(image_data).hexdigest()
+        return f"{self.namespace}-{digest}" if self.namespace else digest
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.txt"
+
+    def _read_disk(self, key: str) -> str | None:
+        path = self._disk_path(key)
+        try:
+            if time.time() - path.stat().st_mtime >= self.disk_ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.disk_entries = max(0, self.disk_entries - 1)
+                return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, text: str) -> None:
+        # 임시 파일에 쓴 뒤 rename → 다른 워커가 반쯤 쓰인 파일을 읽지 않도록
+        path = self._disk_path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        existed = path.exists()
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+        if not existed:
+            self.disk_entries += 1
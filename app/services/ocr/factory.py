@@ -0,0 +1,135 @@
+# app/services/ocr/factory.py
+"""
+앱 수명 동안 공유하는 OCR 서비스 조립
+"""
+from __future__ import annotations
+
+import httpx
+
+from app.config import (
+    NAVER_OCR_SECRET_KEY,
+    NAVER_OCR_INVOKE_URL,
+    NAVER_OCR_TIMEOUT,
+    NAVER_OCR_CONNECT_TIMEOUT,
+    NAVER_OCR_MAX_CONNECTIONS,
+    NAVER_OCR_MAX_KEEPALIVE_CONNECTIONS,
+    NAVER_OCR_KEEPALIVE_EXPIRY,
+    NAVER_OCR_HTTP2,
+    OCR_LAYOUT_ENCODER_ENABLED,
+    OCR_ATTEMPT_TIMEOUT,
+    OCR_MAX_ATTEMPTS,
+    OCR_RETRY_BACKOFF_BASE,
+    OCR_RETRY_BACKOFF_MAX,
+    OCR_RETRY_BUDGET_RATIO,
+    OCR_RETRY_BUDGET_MAX_TOKENS,
+    OCR_HEDGE_ENABLED,
+    OCR_HEDGE_MIN_DELAY,
+    OCR_CIRCUIT_FAILURE_THRESHOLD,
+    OCR_CIRCUIT_RECOVERY_SECONDS,
+    OCR_CACHE_ENABLED,
+    OCR_CACHE_MAX_ENTRIES,
+    OCR_CACHE_TTL_SECONDS,
+    OCR_CACHE_DIR,
+    OCR_CACHE_DISK_MAX_ENTRIES,
+    OCR_CACHE_DISK_SWEEP_INTERVAL,
+    OCR_PREPROCESS_ENABLED,
+    OCR_PREPROCESS_MAX_DIMENSION,
+    OCR_PREPROCESS_FORMAT,
+    OCR_PREPROCESS_QUALITY,
+    OCR_PREPROCESS_CROP_TOP,
+    OCR_PREPROCESS_CROP_BOTTOM,
+)
+from app.services.cache import TTLCache
+from app.services.http import create_async_client
+from app.services.metrics import register_metrics
+from app.services.ocr.base import OCRService
+from app.services.ocr.cache import CachedOCRService, cache_namespace
+from app.services.ocr.naver import NaverOCRService
+from app.services.ocr.preprocess import PreprocessOptions, PreprocessingOCRService
+from app.services.ocr.resilience import CircuitBreaker, ResilientOCRService, RetryBudget
+from app.services.ocr.singleflight import CoalescingOCRService
+
+
+def create_ocr_http_client() -> httpx.AsyncClient:
+    """
+    Clova OCR 전용 keep-alive 커넥션 풀.
+    """
+    return create_async_client(
+        timeout=NAVER_OCR_TIMEOUT,
+        connect_timeout=NAVER_OCR_CONNECT_TIMEOUT,
+        max_connections=NAVER_OCR_MAX_CONNECTIONS,
+        max_keepalive_connections=NAVER_OCR_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=NAVER_OCR_KEEPALIVE_EXPIRY,
+        http2=NAVER_OCR_HTTP2,
+    )
+
+
+def create_ocr_service(client: httpx.AsyncClient) -> OCRService:
+    """
+    공유 HTTP 클라이언트를 주입한 OCR 서비스 인스턴스 생성.
+
+    CachedOCRService → CoalescingOCRService → PreprocessingOCRService
+        → ResilientOCRService → NaverOCRService
+    (캐시 키는 원본 바이트 + 결과에 영향을 주는 설정 기준이라 캐시 히트 시 전처리도 건너뜀,
+     캐시 미스인 같은 이미지가 동시에 들어오면 OCR 한 번만 실행)
+    """
+    service: OCRService = NaverOCRService(
+        secret_key=NAVER_OCR_SECRET_KEY,
+        invoke_url=NAVER_OCR_INVOKE_URL,
+        client=client,
+        layout_aware=OCR_LAYOUT_ENCODER_ENABLED,
+    )
+
+    resilient = ResilientOCRService(
+        inner=service,
+        attempt_timeout=OCR_ATTEMPT_TIMEOUT,
+        max_attempts=OCR_MAX_ATTEMPTS,
+        backoff_base=OCR_RETRY_BACKOFF_BASE,
+        backoff_max=OCR_RETRY_BACKOFF_MAX,
+        retry_budget=RetryBudget(
+            ratio=OCR_RETRY_BUDGET_RATIO,
+            max_tokens=OCR_RETRY_BUDGET_MAX_TOKENS,
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=OCR_CIRCUIT_FAILURE_THRESHOLD,
+            recovery_seconds=OCR_CIRCUIT_RECOVERY_SECONDS,
+        ),
+        hedge_enabled=OCR_HEDGE_ENABLED,
+        hedge_min_delay=OCR_HEDGE_MIN_DELAY,
+    )
+    register_metrics("ocr_resilience", resilient.stats)
+    service = resilient
+
+    preprocess_options = PreprocessOptions(
+        max_dimension=OCR_PREPROCESS_MAX_DIMENSION,
+        output_format=OCR_PREPROCESS_FORMAT,
+        quality=OCR_PREPROCESS_QUALITY,
+        crop_top_ratio=OCR_PREPROCESS_CROP_TOP,
+        crop_bottom_ratio=OCR_PREPROCESS_CROP_BOTTOM,
+    )
+    if OCR_PREPROCESS_ENABLED:
+        service = PreprocessingOCRService(inner=service, options=preprocess_options)
+
+    coalescing = CoalescingOCRService(inner=service)
+    register_metrics("ocr_singleflight", coalescing.stats)
+    service = coalescing
+
+    if OCR_CACHE_ENABLED:
+        cached = CachedOCRService(
+            inner=service,
+            memory_cache=TTLCache(
+                max_entries=OCR_CACHE_MAX_ENTRIES,
+                ttl_seconds=OCR_CACHE_TTL_SECONDS,
+            ),
+            disk_dir=OCR_CACHE_DIR,
+            disk_max_entries=OCR_CACHE_DISK_MAX_ENTRIES,
+            disk_sweep_interval=OCR_CACHE_DISK_SWEEP_INTERVAL,
+            namespace=cache_namespace(
+                layout_aware=OCR_LAYOUT_ENCODER_ENABLED,
+                preprocess=preprocess_options if OCR_PREPROCESS_ENABLED else None,
+            ),
+        )
+        register_metrics("ocr_cache", cached.stats)
+        service = cached
+
+    return service
@@ -0,0 +1,213 @@
+# app/services/ocr/layout.py
+"""
+Clova OCR 필드 좌표(boundingPoly / lineBreak) 기반 대화 재구성
+
+OCR 필드를 말풍선 단위로 묶고, 가로 위치로 화자(나 / 상대)를 구분하고,
+시간·읽음 표시 같은 UI 노이즈를 버려서 짧은 화자 태그 대화로 만든다.
+
+    상대: 오늘 뭐해?
+    나: 집에서 쉬는 중 ㅎㅎ 너는?
+"""
+from __future__ import annotations
+
+import re
+import statistics
+from dataclasses import dataclass
+
+ME = "나"
+THEM = "상대"
+
+# 말풍선 중심이 화면 가로 이 비율보다 오른쪽이면 내 메시지
+ME_CENTER_RATIO = 0.5
+# 화면 위/아래 이 비율 안쪽은 상태바 / 입력창 영역
+TOP_UI_RATIO = 0.06
+BOTTOM_UI_RATIO = 0.08
+# 평균 글자 높이 대비 이보다 작은 필드는 부가 정보(읽음 숫자, 시간, 이름표)
+SMALL_TEXT_RATIO = 0.8
+# 같은 화자의 줄 사이 간격이 글자 높이의 이 배수 이하이면 같은 말풍선
+BUBBLE_GAP_RATIO = 1.0
+
+_TIME_RE = re.compile(r"^\d{1,2}:\d{2}$")
+_MERIDIEM = {"오전", "오후", "AM", "PM", "am", "pm"}
+_READ_RECEIPT_RE = re.compile(r"^\d{1,3}$")
+_DATE_RE = re.compile(r"^\d{4}년$|^\d{1,2}월$|^\d{1,2}일$|^.요일$")
+_UI_LABELS = {"읽음", "Read", "메시지 입력", "메시지", "입력", "전송", "#"}
+
+
+@dataclass
+class OCRField:
+    text: str
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    line_break: bool
+
+    @property
+    def height(self) -> float:
+        return self.y_max - self.y_min
+
+
+@dataclass
+class _Line:
+    text: str
+    x_min: float
+    x_max: float
+    y_min: float
+    y_max: float
+    height: float
+
+    @property
+    def center_x(self) -> float:
+        return (self.x_min + self.x_max) / 2
+
+
+def parse_clova_image(image_result: dict) -> tuple[list[OCRField], float | None, float | None]:
+    """
+    Clova 응답의 images[0]에서 (필드 목록, 이미지 너비, 이미지 높이) 추출.
+    좌표가 없는 필드는 건너뜀.
+    """
+    fields: list[OCRField] = []
+    for raw in image_result.get("fields", []):
+        text = (raw.get("inferText") or "").strip()
+        vertices = (raw.get("boundingPoly") or {}).get("vertices") or []
+        if not text or not vertices:
+            continue
+        xs = [v.get("x", 0.0) for v in vertices]
+        ys = [v.get("y", 0.0) for v in vertices]
+        fields.append(
+            OCRField(
+                text=text,
+                x_min=min(xs),
+                x_max=max(xs),
+                y_min=min(ys),
+                y_max=max(ys),
+                line_break=bool(raw.get("lineBreak", False)),
+            )
+        )
+
+    info = image_result.get("convertedImageInfo") or {}
+    width = info.get("width") or (max(f.x_max for f in fields) if fields else None)
+    height = info.get("height") or (max(f.y_max for f in fields) if fields else None)
+    return fields, width, height
+
+
+def _is_noise(field: OCRField, small_height: float) -> bool:
+    """읽음 숫자, 날짜 구분선, UI 라벨 같은 필드 단위 노이즈."""
+    text = field.text
+    if text in _UI_LABELS:
+        return True
+    return field.height < small_height and bool(
+        _READ_RECEIPT_RE.match(text) or _DATE_RE.match(text)
+    )
+
+
+def _drop_noise_fields(fields: list[OCRField], median_height: float) -> list[OCRField]:
+    """한 줄 안에서 시간(오후 3:21), 읽음 숫자 등 노이즈 필드 제거."""
+    kept: list[OCRField] = []
+    small_height = median_height * SMALL_TEXT_RATIO
+
+    for field in fields:
+        if _TIME_RE.match(field.text):
+            # "7:30" 같은 실제 메시지는 남기고, 작은 글씨이거나 "오전/오후" 뒤에 붙은 시간만 제거
+            after_meridiem = bool(kept) and kept[-1].text in _MERIDIEM
+            if after_meridiem or field.height < small_height:
+                # 바로 앞의 "오전/오후"도 함께 제거
+                if after_meridiem:
+                    kept.pop()
+                continue
+        if _is_noise(field, small_height):
+            continue
+        kept.append(field)
+
+    return kept
+
+
+def _build_lines(fields: list[OCRField], median_height: float) -> list[_Line]:
+    """lineBreak 기준으로 필드를 줄로 묶고, 줄마다 노이즈 필드 제거."""
+    lines: list[_Line] = []
+    current: list[OCRField] = []
+
+    def flush() -> None:
+        kept = _drop_noise_fields(current, median_height)
+        current.clear()
+        if not kept:
+            return
+        lines.append(
+            _Line(
+                text=" ".join(f.text for f in kept),
+                x_min=min(f.x_min for f in kept),
+                x_max=max(f.x_max for f in kept),
+                y_min=min(f.y_min for f in kept),
+                y_max=max(f.y_max for f in kept),
+                height=statistics.median(f.height for f in kept),
+            )
+        )
+
+    for field in fields:
+        current.append(field)
+        if field.line_break:
+            flush()
+    flush()
+    return lines
+
+
+def encode_conversation(
+    fields: list[OCRField],
+    image_width: float | None,
+    image_height: float | None = None,
+) -> str:
+    """
+    OCR 필드 → 화자 태그가 붙은 말풍선 단위 대화 텍스트.
+    좌표 정보가 부족하면 필드 텍스트를 줄바꿈으로만 이어서 반환.
+    """
+    if not fields or not image_width:
+        return "\n".join(f.text for f in fields)
+
+    median_height = statistics.median(f.height for f in fields) or 1.0
+    lines = _build_lines(fields, median_height)
+
+    # 상태바 / 하단 입력창 영역 제거
+    if image_height:
+        top_limit = image_height * TOP_UI_RATIO
+        bottom_limit = image_height * (1 - BOTTOM_UI_RATIO)
+        lines = [l for l in lines if l.y_max > top_limit and l.y_min < bottom_limit]
+    if not lines:
+        return ""
+
+    # 말풍선 본문 글자 높이 기준 (시간/읽음 같은 작은 필드가 빠진 뒤의 줄 높이)
+    line_height = statistics.median(l.height for l in lines)
+
+    bubbles: list[tuple[str, list[_Line]]] = []
+    for index, line in enumerate(lines):
+        speaker = ME if line.center_x > image_width * ME_CENTER_RATIO else THEM
+
+        # 상대 말풍선 바로 위의 작은 글씨 한 줄은 이름표
+        if speaker == THEM and line.height < line_height * SMALL_TEXT_RATIO:
+            next_line = lines[index + 1] if index + 1 < len(lines) else None
+            if next_line is not None and next_line.center_x <= image_width * ME_CENTER_RATIO:
+                continue
+
+        if bubbles and bubbles[-1][0] == speaker:
+            previous = bubbles[-1][1][-1]
+            if line.y_min - previous.y_max <= line_height * BUBBLE_GAP_RATIO:
+                bubbles[-1][1].append(line)
+                continue
+
+        bubbles.append((speaker, [line]))
+
+    return "\n".join(
+        f"{speaker}: {' '.join(l.text for l in bubble_lines)}"
+        for speaker, bubble_lines in bubbles
+    )
+
+
+def is_speaker_tagged(conversation: str) -> bool:
+    """
+    모든 줄이 "나:" / "상대:"로 시작하는 화자 태그 대화인지.
+    (레이아웃 인코더를 끈 경우, 좌표가 없어 줄바꿈으로만 이은 경우, 직접 입력한 텍스트는 False)
+    """
+    lines = [line for line in conversation.splitlines() if line.strip()]
+    return bool(lines) and all(
+        line.startswith((f"{ME}:", f"{THEM}:")) for line in lines
+    )
@@ -5,25 +5,45 @@ from __future__ import annotations
 
 import logging
 import uuid
-import json
 import base64
 from pathlib import Path
 
 import httpx
 
+from app.services.ocr.base import OCRError, read_image_file
+from app.services.ocr.layout import encode_conversation, parse_clova_image
+
 logger = logging.getLogger("syrano")
 
 
+def _is_retryable(error: Exception) -> bool:
+    """타임아웃 / 연결 오류 / 429 / 5xx만 재시도 대상."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
 class NaverOCRService:
     """Naver Clova OCR 서비스 구현"""
     
-    def __init__(self, secret_key: str, invoke_url: str):
+    def __init__(
+        self,
+        secret_key: str,
+        invoke_url: str,
+        client: httpx.AsyncClient | None = None,
+        layout_aware: bool = False,
+    ):
         self.secret_key = secret_key
         self.invoke_url = invoke_url
+        # 앱 수명 동안 공유하는 커넥션 풀 (없으면 호출마다 임시 클라이언트 사용)
+        self.client = client
+        # True면 좌표 기반으로 화자 태그 대화로 재구성 (app/services/ocr/layout.py)
+        self.layout_aware = layout_aware
     
     async def extract_text(self, image_path: str | Path) -> str:
         """
-        Naver Clova OCR로 이미지에서 텍스트를 추출합니다.
+        Naver Clova OCR로 이미지 파일에서 텍스트를 추출합니다.
         
         Args:
             image_path: 이미지 파일 경로
@@ -32,26 +52,39 @@ class NaverOCRService:
             추출된 텍스트 (줄바꿈으로 구분)
             
         Raises:
-            Exception: OCR 처리 중 오류 발생 시
+            OCRError: OCR 처리 중 오류 발생 시 (retryable로 일시적 오류 구분)
         """
         try:
-            # 이미지 파일을 base64로 인코딩
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
+            image_data, image_format = await read_image_file(image_path)
+        except Exception as e:
+            logger.exception(f"Failed to read image: {image_path}")
+            raise OCRError(f"텍스트 추출 중 오류 발생: {str(e)}") from e
+
+        return await self.extract_text_from_bytes(image_data, image_format)
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        """
+        Naver Clova OCR로 메모리의 이미지 바이트에서 텍스트를 추출합니다.
+        
+        Args:
+            image_data: 이미지 바이트
+            image_format: 이미지 포맷 (jpeg, png 등)
             
+        Returns:
+            추출된 텍스트 (줄바꿈으로 구분)
+            
+        Raises:
+            OCRError: OCR 처리 중 오류 발생 시 (retryable로 일시적 오류 구분)
+        """
+        try:
             # base64 인코딩
             image_base64 = base64.b64encode(image_data).decode('utf-8')
             
-            # 파일 확장자 확인
-            file_extension = Path(image_path).suffix.lower().replace('.', '')
-            if file_extension == 'jpg':
-                file_extension = 'jpeg'
-            
             # 요청 JSON
             request_json = {
                 'images': [
                     {
-                        'format': file_extension,
+                        'format': image_format,
                         'name': 'demo',
                         'data': image_base64  # ← base64 데이터 전송
                     }
@@ -64,32 +97,29 @@ class NaverOCRService:
             # API 호출
             logger.info(f"Calling Naver OCR API: {self.invoke_url}")
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.invoke_url,
-                    headers={
-                        'X-OCR-SECRET': self.secret_key,
-                        'Content-Type': 'application/json'
-                    },
-                    json=request_json,  # ← JSON으로 전송
-                    timeout=30.0
-                )
-                
-                response.raise_for_status()
-                result = response.json()
+            response = await self._post(request_json)
+            response.raise_for_status()
+            result = response.json()
             
             logger.info(f"API Response Status: {response.status_code}")
             
             # 텍스트 추출
             texts = []
+            image_result = {}
             if 'images' in result and len(result['images']) > 0:
-                fields = result['images'][0].get('fields', [])
+                image_result = result['images'][0]
+                fields = image_result.get('fields', [])
                 for field in fields:
                     text = field.get('inferText', '')
                     if text:
                         texts.append(text)
             
-            extracted_text = '\n'.join(texts)
+            if self.layout_aware:
+                # 말풍선 단위 + 화자 태그 + UI 노이즈 제거
+                fields, width, height = parse_clova_image(image_result)
+                extracted_text = encode_conversation(fields, width, height)
+            else:
+                extracted_text = '\n'.join(texts)
             
             # 상세 로그
             logger.info("=" * 80)
@@ -105,5 +135,31 @@ class NaverOCRService:
             return extracted_text.strip()
             
         except Exception as e:
-            logger.exception(f"Naver Clova OCR failed for image: {image_path}")
-            raise Exception(f"텍스트 추출 중 오류 발생: {str(e)}") from e
\ No newline at end of file
+            logger.exception(f"Naver Clova OCR failed for image ({len(image_data)} bytes)")
+            raise OCRError(
+                f"텍스트 추출 중 오류 발생: {str(e)}",
+                retryable=_is_retryable(e),
+            ) from e
+
+    async def _post(self, request_json: dict) -> httpx.Response:
+        """
+        공유 클라이언트로 OCR API 호출 (keep-alive 커넥션 재사용).
+        """
+        headers = {
+            'X-OCR-SECRET': self.secret_key,
+            'Content-Type': 'application/json'
+        }
+
+        if self.client is not None:
+            return await self.client.post(
+                self.invoke_url,
+                headers=headers,
+                json=request_json,  # ← JSON으로 전송
+            )
+
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.post(
+                self.invoke_url,
+                headers=headers,
+                json=request_json,
+            )
@@ -0,0 +1,107 @@
+# app/services/ocr/preprocess.py
+"""
+OCR 전송 전 이미지 전처리 (축소 / 재인코딩 / 상태바·키보드 크롭)
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.ocr.base import OCRService, read_image_file
+
+logger = logging.getLogger("syrano")
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """전처리 설정"""
+    max_dimension: int = 2048        # 긴 변 기준 최대 픽셀
+    output_format: str = "jpeg"      # jpeg | png (Clova가 지원하는 포맷만, WebP는 Clova 미지원)
+    quality: int = 85                # JPEG 품질
+    crop_top_ratio: float = 0.0      # 상단(상태바) 잘라낼 비율
+    crop_bottom_ratio: float = 0.0   # 하단(키보드/입력창) 잘라낼 비율
+
+
+def preprocess_image(
+    image_data: bytes,
+    image_format: str,
+    options: PreprocessOptions,
+) -> tuple[bytes, str]:
+    """
+    이미지를 OCR에 충분한 크기/포맷으로 줄여서 (바이트, 포맷) 반환.
+
+    - CPU 작업이므로 이벤트 루프에서 직접 부르지 말고 asyncio.to_thread로 실행
+    - Pillow가 없거나 디코딩 실패 시 원본 그대로 반환
+    - 크롭하지 않았고 결과가 원본보다 크면 원본 그대로 반환 (크롭했으면 항상 결과 사용)
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        logger.warning("Pillow is not installed, skipping OCR preprocessing")
+        return image_data, image_format
+
+    try:
+        with Image.open(io.BytesIO(image_data)) as opened:
+            image = ImageOps.exif_transpose(opened)
+
+            # 1) 상태바 / 키보드 영역 크롭
+            width, height = image.size
+            top = int(height * options.crop_top_ratio)
+            bottom = height - int(height * options.crop_bottom_ratio)
+            cropped = (top > 0 or bottom < height) and bottom > top
+            if cropped:
+                image = image.crop((0, top, width, bottom))
+
+            # 2) 긴 변 기준 축소 (비율 유지)
+            if max(image.size) > options.max_dimension:
+                image.thumbnail(
+                    (options.max_dimension, options.max_dimension),
+                    Image.Resampling.LANCZOS,
+                )
+
+            # 3) 재인코딩 (png가 아니면 jpeg, 반환 포맷은 실제로 쓴 포맷)
+            buffer = io.BytesIO()
+            if options.output_format == "png":
+                output_format = "png"
+                image.save(buffer, format="PNG", optimize=True)
+            else:
+                output_format = "jpeg"
+                if image.mode != "RGB":
+                    image = image.convert("RGB")
+                image.save(buffer, format="JPEG", quality=options.quality, optimize=True)
+    except Exception:
+        logger.warning("OCR preprocessing failed, sending original image", exc_info=True)
+        return image_data, image_format
+
+    processed = buffer.getvalue()
+    if not cropped and len(processed) >= len(image_data):
+        return image_data, image_format
+
+    return processed, output_format
+
+
+class PreprocessingOCRService:
+    """
+    OCRService를 감싸서 전처리한 이미지를 내부 OCR에 전달.
+    """
+
+    def __init__(self, inner: OCRService, options: PreprocessOptions):
+        self.inner = inner
+        self.options = options
+
+    async def extract_text(self, image_path: str | Path) -> str:
+        image_data, image_format = await read_image_file(image_path)
+        return await self.extract_text_from_bytes(image_data, image_format)
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        processed, processed_format = await asyncio.to_thread(
+            preprocess_image, image_data, image_format, self.options
+        )
+        logger.info(
+            f"OCR preprocessing: {len(image_data)} → {len(processed)} bytes "
+            f"({image_format} → {processed_format})"
+        )
+        return await self.inner.extract_text_from_bytes(processed, processed_format)
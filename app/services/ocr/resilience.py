@@ -0,0 +1,275 @@
+# app/services/ocr/resilience.py
+"""
+OCR 호출 안정화 레이어
+
+- 시도별 데드라인 (asyncio.timeout)
+- 지터 백오프 재시도 + 전역 재시도 예산 (재시도 폭주 방지)
+- p95 지연 이후 두 번째 요청을 보내는 헤지 요청 (선택)
+- 연속 실패 시 서킷 브레이커로 즉시 OCRUnavailableError (→ 503)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from pathlib import Path
+
+from app.services.ocr.base import (
+    OCRError,
+    OCRService,
+    OCRUnavailableError,
+    read_image_file,
+)
+
+logger = logging.getLogger("syrano")
+
+
+class CircuitBreaker:
+    """
+    closed → (연속 실패 failure_threshold회) → open
+    open → (recovery_seconds 경과) → half_open: 시험 요청 1개만 허용
+    half_open → 성공 시 closed / 실패 시 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        # half_open: 시험 요청 하나만 통과
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("OCR circuit closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """시험 요청이 결과 없이 끝난 경우(클라이언트 취소 등) 다음 시험 요청 허용."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"OCR circuit opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class RetryBudget:
+    """
+    전역 재시도 예산 (토큰 버킷).
+
+    - 원 요청마다 ratio 만큼 적립, 재시도/헤지 1회마다 1 차감
+    - 장애 시 재시도가 원 트래픽의 ratio 비율을 넘지 않도록 제한
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class ResilientOCRService:
+    """
+    OCRService를 감싸서 데드라인 / 재시도 / 헤지 / 서킷 브레이커 적용.
+    """
+
+    # 헤지 지연을 계산하기 위한 최소 표본 수
+    MIN_LATENCY_SAMPLES = 20
+
+    def __init__(
+        self,
+        inner: OCRService,
+        *,
+        attempt_timeout: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        retry_budget: RetryBudget,
+        breaker: CircuitBreaker,
+        hedge_enabled: bool = True,
+        hedge_min_delay: float = 1.0,
+        latency_window: int = 200,
+    ):
+        self.inner = inner
+        self.attempt_timeout = attempt_timeout
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_budget = retry_budget
+        self.breaker = breaker
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.rejected = 0
+        self.failures = 0
+
+    async def extract_text(self, image_path: str | Path) -> str:
+        image_data, image_format = await read_image_file(image_path)
+        return await self.extract_text_from_bytes(image_data, image_format)
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        if not self.breaker.allow_request():
+            self.rejected += 1
+            raise OCRUnavailableError("OCR 서비스가 일시적으로 불안정해요.", retryable=True)
+
+        self.calls += 1
+        self.retry_budget.deposit()
+
+        try:
+            return await self._call_with_retries(image_data, image_format)
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+
+    async def _call_with_retries(self, image_data: bytes, image_format: str) -> str:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                text = await self._attempt(image_data, image_format)
+            except OCRError as e:
+                if not e.retryable:
+                    # 잘못된 이미지 등 요청 자체 문제 → 백엔드 상태와 무관
+                    self.breaker.record_success()
+                    raise
+
+                self.failures += 1
+                self.breaker.record_failure()
+                can_retry = (
+                    attempt < self.max_attempts
+                    and self.breaker.allow_request()
+                    and self.retry_budget.withdraw()
+                )
+                if not can_retry:
+                    raise OCRUnavailableError(
+                        f"OCR 서비스가 일시적으로 불안정해요: {e}",
+                        retryable=True,
+                    ) from e
+
+                self.retries += 1
+                delay = self._backoff(attempt)
+                logger.warning(f"OCR attempt {attempt} failed, retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return text
+
+        raise OCRUnavailableError("OCR 서비스가 일시적으로 불안정해요.", retryable=True)
+
+    def stats(self) -> dict:
+        return {
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "calls": self.calls,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "p95_latency_seconds": self._p95(),
+        }
+
+    async def _attempt(self, image_data: bytes, image_format: str) -> str:
+        """
+        데드라인 안에서 한 번 시도. p95보다 늦어지면 헤지 요청을 하나 더 보내고
+        먼저 성공한 결과를 사용.
+        """
+        tasks: set[asyncio.Task[str]] = set()
+        try:
+            async with asyncio.timeout(self.attempt_timeout):
+                tasks.add(asyncio.create_task(self._call(image_data, image_format)))
+
+                hedge_delay = self._hedge_delay()
+                if hedge_delay is not None:
+                    done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                    if not done and self.retry_budget.withdraw():
+                        self.hedges += 1
+                        logger.info(f"OCR hedged request sent after {hedge_delay:.2f}s")
+                        tasks.add(asyncio.create_task(self._call(image_data, image_format)))
+
+                error: BaseException | None = None
+                while tasks:
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        # 취소된 Task는 exception()이 CancelledError를 던지므로 먼저 확인
+                        if task.cancelled():
+                            continue
+                        if task.exception() is None:
+                            return task.result()
+                        error = task.exception()
+                if error is None:
+                    raise OCRError("OCR 요청이 취소됐어요.", retryable=True)
+                raise error
+        except TimeoutError as e:
+            raise OCRError(
+                f"OCR 응답 시간 초과 ({self.attempt_timeout}s)",
+                retryable=True,
+            ) from e
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _call(self, image_data: bytes, image_format: str) -> str:
+        started = time.monotonic()
+        text = await self.inner.extract_text_from_bytes(image_data, image_format)
+        self._latencies.append(time.monotonic() - started)
+        return text
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: 0 ~ min(max, base * 2^(attempt-1))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def _p95(self) -> float | None:
+        if len(self._latencies) < self.MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return round(ordered[int(len(ordered) * 0.95) - 1], 3)
+
+    def _hedge_delay(self) -> float | None:
+        if not self.hedge_enabled:
+            return None
+        p95 = self._p95()
+        if p95 is None:
+            return None
+        return max(p95, self.hedge_min_delay)
@@ -0,0 +1,38 @@
+# app/services/ocr/singleflight.py
+"""
+같은 이미지에 대한 동시 OCR 호출 합치기
+"""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from app.services.ocr.base import OCRService, read_image_file
+from app.services.singleflight import SingleFlight
+
+
+class CoalescingOCRService:
+    """
+    OCRService를 감싸서 같은 이미지(바이트 SHA-256)에 대한 진행 중 OCR을 공유.
+
+    캐시는 끝난 결과만 재사용하므로, 첫 요청의 OCR이 끝나기 전에
+    같은 이미지가 또 들어오면 여기서 같은 호출 결과를 함께 기다린다.
+    """
+
+    def __init__(self, inner: OCRService):
+        self.inner = inner
+        self.flights: SingleFlight[str, str] = SingleFlight()
+
+    async def extract_text(self, image_path: str | Path) -> str:
+        image_data, image_format = await read_image_file(image_path)
+        return await self.extract_text_from_bytes(image_data, image_format)
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        key = hashlib.sha256(image_data).hexdigest()
+        return await self.flights.do(
+            key,
+            lambda: self.inner.extract_text_from_bytes(image_data, image_format),
+        )
+
+    def stats(self) -> dict:
+        return self.flights.stats()
@@ -0,0 +1,57 @@
+# app/services/pagination.py
+"""
+keyset(cursor) 페이지네이션 헬퍼
+
+OFFSET은 앞 페이지 행을 모두 읽고 버리므로 뒤로 갈수록 느려짐.
+대신 마지막으로 받은 행의 (created_at, id)를 커서로 돌려주고,
+다음 페이지는 그보다 "뒤"인 행부터 인덱스로 바로 찾아 읽음 → 페이지 크기만큼만 읽음.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, literal, tuple_
+
+# 페이지 크기 기본값 / 최대값
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """(created_at, id) → URL에 그대로 넣을 수 있는 불투명 문자열."""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """encode_cursor의 역. 형식이 틀리면 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(uuid.UUID(id))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail="잘못된 페이지 커서예요.",
+        ) from e
+
+
+def after_cursor(
+    created_at_column: ColumnElement[datetime],
+    id_column: ColumnElement[str],
+    cursor: str,
+) -> ColumnElement[bool]:
+    """
+    최신순(created_at DESC, id DESC) 목록에서 커서 다음 행들 조건.
+    (created_at, id) < (커서) 행 비교 → (..., created_at DESC, id DESC) 인덱스 범위 스캔.
+    """
+    created_at, id = decode_cursor(cursor)
+    return tuple_(created_at_column, id_column) < tuple_(
+        # 커서 값도 컬럼과 같은 타입(timestamptz / uuid)으로 바인딩
+        literal(created_at, created_at_column.type),
+        literal(id, id_column.type),
+    )
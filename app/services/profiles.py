@@ -1,10 +1,24 @@
 # app/services/profiles.py
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.profile import Profile
+from app.services.pagination import after_cursor, encode_cursor
+
+# 목록 summary 모드에서 읽는 컬럼 (memo 제외, ix_profiles_user_id_created_at에 모두 포함)
+SUMMARY_COLUMNS = (
+    Profile.id,
+    Profile.user_id,
+    Profile.name,
+    Profile.age,
+    Profile.gender,
+    Profile.created_at,
+    Profile.updated_at,
+)
 
 
 async def create_profile(
@@ -44,19 +58,70 @@ async def get_profile_by_id(
     return result.scalar_one_or_none()
 
 
-async def get_profiles_by_user_id(
+async def get_profile_version(
+    session: AsyncSession,
+    profile_id: str,
+) -> datetime | None:
+    """
+    프로필 버전(updated_at)만 조회 (ETag 비교용, 전체 행 / ORM 객체 생성 없음)
+    """
+    result = await session.execute(
+        select(Profile.updated_at).where(Profile.id == profile_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_profiles_version(
     session: AsyncSession,
     user_id: str,
-) -> list[Profile]:
+) -> tuple[int, datetime | None]:
     """
-    사용자의 모든 프로필 조회
+    사용자 프로필 목록 버전 (개수, 가장 최근 updated_at) 조회 (ETag 비교용)
+
+    - 생성/수정은 max(updated_at), 삭제는 개수로 바뀜
+    - updated_at이 ix_profiles_user_id_created_at에 포함돼 있어 index-only scan
     """
     result = await session.execute(
-        select(Profile)
-        .where(Profile.user_id == user_id)
-        .order_by(Profile.created_at.desc())
+        select(func.count(), func.max(Profile.updated_at)).where(Profile.user_id == user_id)
+    )
+    count, last_updated_at = result.one()
+    return count, last_updated_at
+
+
+async def get_profiles_page(
+    session: AsyncSession,
+    user_id: str,
+    limit: int | None,
+    cursor: str | None = None,
+    summary: bool = False,
+) -> tuple[list[Profile] | list[Row], str | None]:
+    """
+    사용자의 프로필을 최신순으로 limit개 + 다음 페이지 커서 조회
+    (limit=None이면 전체 조회, 다음 페이지 커서 없음)
+
+    - (user_id, created_at DESC, id DESC) 인덱스에서 커서 위치부터 읽음 → 정렬 없음, 페이지당 일정 비용
+    - summary=True면 memo를 빼고 인덱스에 포함된 컬럼만 조회 (ORM 객체 생성 없음, index-only scan 가능)
+    """
+    if summary:
+        query = select(*SUMMARY_COLUMNS)
+    else:
+        query = select(Profile)
+    query = (
+        query.where(Profile.user_id == user_id)
+        .order_by(Profile.created_at.desc(), Profile.id.desc())
     )
-    return list(result.scalars().all())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    if cursor is not None:
+        query = query.where(after_cursor(Profile.created_at, Profile.id, cursor))
+
+    result = await session.execute(query)
+    rows = list(result.all() if summary else result.scalars())
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
 
 
 async def update_profile(
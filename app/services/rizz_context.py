@@ -0,0 +1,108 @@
+# app/services/rizz_context.py
+"""
+/rizz/* 요청 컨텍스트 로딩 (사용량 체크/증가 + 소유 프로필 조회)
+
+OCR/LLM 호출(수 초 ~ 수십 초) 동안 DB 커넥션을 잡고 있지 않도록
+필요한 데이터는 짧은 세션 하나에서 모두 읽고, 세션과 무관한 불변 객체로 넘긴다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import session_scope
+from app.models.profile import Profile
+from app.schemas.rizz import UsageInfo
+from app.services.subscriptions import check_and_increment_usage
+
+
+@dataclass(frozen=True)
+class ProfileContext:
+    """프롬프트 / LLM 캐시 키에 필요한 프로필 값만 담은 스냅샷 (ORM 객체 아님)."""
+    id: str
+    name: str
+    age: int | None
+    gender: str | None
+    memo: str | None
+    updated_at: datetime | None
+
+
+@dataclass(frozen=True)
+class RizzContext:
+    """LLM 레이어에 넘기는 요청 컨텍스트."""
+    user_id: str
+    usage_info: UsageInfo
+    profile: ProfileContext | None = None
+
+    @property
+    def is_premium(self) -> bool:
+        """LLM 모델 선택용 (사용량 카운터가 판단한 값)"""
+        return self.usage_info.is_premium
+
+
+_PROFILE_CONTEXT_COLUMNS = (
+    Profile.id,
+    Profile.name,
+    Profile.age,
+    Profile.gender,
+    Profile.memo,
+    Profile.updated_at,
+)
+
+
+async def get_owned_profile_context(
+    session: AsyncSession,
+    user_id: str,
+    profile_id: str,
+) -> ProfileContext:
+    """
+    profile_id + user_id 조건으로 한 번에 조회 (소유자 검증을 쿼리에서 처리)
+    
+    - 필요한 컬럼만 조회 (ORM 객체 생성 없음)
+    - 다른 사용자의 프로필도 존재 여부를 드러내지 않도록 없는 프로필과 같은 404
+    """
+    row = (
+        await session.execute(
+            select(*_PROFILE_CONTEXT_COLUMNS).where(
+                Profile.id == profile_id,
+                Profile.user_id == user_id,
+            )
+        )
+    ).one_or_none()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=404,
+            detail="해당 프로필을 찾을 수 없어요.",
+        )
+    
+    return ProfileContext(**row._mapping)
+
+
+async def load_rizz_context(
+    user_id: str,
+    profile_id: str | None,
+) -> RizzContext:
+    """
+    프로필 조회 + 사용량 체크/증가를 짧은 세션 하나로 처리하고 커넥션 반납.
+    
+    - 프로필(소유자 검증 포함)을 먼저 조회 → 없는 / 다른 사용자 프로필이면 사용량을 쓰지 않고 404
+    - 구독 상태(is_premium / 한도)는 사용량 카운터가 판단
+      (db 백엔드는 UPDATE ... RETURNING 한 번, memory 백엔드는 보통 DB 조회 없음)
+    
+    Raises:
+        HTTPException(404): 프로필 없음(또는 다른 사용자 프로필) / 구독 정보 없음
+        HTTPException(429): 무료 사용자 일일 한도 초과
+    """
+    async with session_scope() as session:
+        profile = None
+        if profile_id is not None:
+            profile = await get_owned_profile_context(session, user_id, profile_id)
+        
+        usage_info = await check_and_increment_usage(session, user_id)
+    
+    return RizzContext(user_id=user_id, usage_info=usage_info, profile=profile)
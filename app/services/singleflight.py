@@ -0,0 +1,66 @@
+# app/services/singleflight.py
+"""
+같은 키로 동시에 들어온 작업 합치기 (single-flight)
+
+더블 탭 / 모바일 재전송으로 같은 입력의 요청이 동시에 여러 개 들어오면
+첫 요청(leader)만 실제로 실행하고, 나머지(follower)는 그 결과를 함께 기다린다.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    키별 진행 중 작업(Task) 레지스트리.
+
+    - 작업은 별도 Task로 실행하고 asyncio.shield로 기다림
+      → 먼저 온 요청이 취소(클라이언트 연결 끊김)돼도 기다리는 다른 요청은 결과를 받음
+    - 작업이 끝나면(성공/실패 모두) 바로 레지스트리에서 빠짐 → 결과 재사용은 캐시의 몫
+    - 이벤트 루프 한 스레드에서만 쓰므로 락 없음
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Future[V]] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        """진행 중인 같은 키 작업이 있으면 그 결과를, 없으면 fn()을 실행한 결과를 반환."""
+        joined = self.join(key)
+        if joined is not None:
+            return await joined
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        self.leaders += 1
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def join(self, key: K) -> Awaitable[V] | None:
+        """같은 키 작업이 진행 중이면 그 결과를 기다리는 awaitable, 없으면 None."""
+        future = self._calls.get(key)
+        if future is None:
+            return None
+        self.coalesced += 1
+        return asyncio.shield(future)
+
+    def stats(self) -> dict:
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+    def _forget(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # 기다리던 요청이 모두 취소된 경우에도 "exception was never retrieved" 경고 방지
+        if not future.cancelled():
+            future.exception()
@@ -1,14 +1,79 @@
 # app/services/subscriptions.py
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone, date
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import HTTPException
 
+from app.config import (
+    SUBSCRIPTION_CACHE_MAX_ENTRIES,
+    SUBSCRIPTION_CACHE_TTL_SECONDS,
+    SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL,
+)
+from app.db import AsyncSessionLocal
 from app.models import Subscription
 from app.schemas.rizz import UsageInfo
+from app.services.cache import TTLCache
+from app.services.metrics import register_metrics
+from app.services.usage_counter import get_usage_counter
+
+logger = logging.getLogger("syrano")
+
+
+@dataclass(frozen=True)
+class SubscriptionStatus:
+    """세션과 무관하게 캐시해 둘 수 있는 구독 상태 스냅샷."""
+    user_id: str
+    is_premium: bool
+    plan_type: str | None
+    expires_at: datetime | None
+
+    @classmethod
+    def from_subscription(cls, subscription: Subscription) -> "SubscriptionStatus":
+        """만료 시각이 지났지만 아직 스위퍼가 처리 안 한 구독은 무료로 표시."""
+        if not is_subscription_active(subscription.is_premium, subscription.expires_at):
+            return cls(
+                user_id=subscription.user_id,
+                is_premium=False,
+                plan_type=None,
+                expires_at=None,
+            )
+        return cls(
+            user_id=subscription.user_id,
+            is_premium=subscription.is_premium,
+            plan_type=subscription.plan_type,
+            expires_at=subscription.expires_at,
+        )
+
+
+# user_id → 구독 상태 (TTL과 expires_at 중 먼저 오는 시점에 만료)
+_status_cache: TTLCache[str, SubscriptionStatus] = TTLCache(
+    max_entries=SUBSCRIPTION_CACHE_MAX_ENTRIES,
+    ttl_seconds=SUBSCRIPTION_CACHE_TTL_SECONDS,
+)
+register_metrics("subscription_cache", _status_cache.stats)
+
+# 만료 스위퍼 (lifespan에서 시작/정지)
+_sweeper_task: asyncio.Task[None] | None = None
+_sweeper_stats = {"runs": 0, "expired": 0, "failures": 0}
+register_metrics("subscription_expiry", lambda: dict(_sweeper_stats))
+
+
+def _cache_status(status: SubscriptionStatus) -> None:
+    ttl = SUBSCRIPTION_CACHE_TTL_SECONDS
+    if status.is_premium and status.expires_at is not None:
+        # 만료 시각이 지나면 다시 DB에서 읽어서 만료 처리되도록
+        until_expiry = (status.expires_at - datetime.now(timezone.utc)).total_seconds()
+        ttl = min(ttl, until_expiry)
+    _status_cache.set(status.user_id, status, ttl=ttl)
+
+
+def invalidate_subscription_status(user_id: str) -> None:
+    _status_cache.invalidate(user_id)
 
 
 async def get_subscription_by_user_id(
@@ -20,6 +85,28 @@ async def get_subscription_by_user_id(
     )
     return result.scalar_one_or_none()
 
+async def get_subscription_status(
+    session: AsyncSession,
+    user_id: str,
+) -> SubscriptionStatus | None:
+    """
+    구독 상태 조회 (캐시 우선).
+
+    - 캐시 미스일 때만 DB 조회 후 캐시
+    - 구독이 없으면 None (캐시하지 않음)
+    """
+    status = _status_cache.get(user_id)
+    if status is not None:
+        return status
+
+    subscription = await get_subscription_by_user_id(session, user_id)
+    if subscription is None:
+        return None
+
+    status = SubscriptionStatus.from_subscription(subscription)
+    _cache_status(status)
+    return status
+
 async def activate_subscription(
     session: AsyncSession,
     user_id: str,
@@ -58,35 +145,91 @@ async def activate_subscription(
     await session.commit()
     await session.refresh(subscription)
 
+    # 캐시된 구독 상태 갱신 (write-through) + 메모리 카운터가 들고 있는 프리미엄 상태 갱신
+    _cache_status(SubscriptionStatus.from_subscription(subscription))
+    get_usage_counter().invalidate(user_id)
+
     return subscription
 
-async def check_and_update_subscription_status(
-    session: AsyncSession,
-    subscription: Subscription,
-) -> None:
+def is_subscription_active(
+    is_premium: bool,
+    expires_at: datetime | None,
+    now: datetime | None = None,
+) -> bool:
     """
-    만료 확인 및 자동 처리
+    만료 확인 (메모리 비교만, DB 쓰기 없음)
     
-    - is_premium=True이고 expires_at이 과거면 → is_premium=False로 변경
+    - is_premium=True이고 expires_at이 과거면 → 무료로 취급
     - expires_at이 None이면 영구 프리미엄
+    - DB의 만료 처리는 백그라운드 스위퍼(expire_due_subscriptions)가 일괄로 담당
     """
-    # 이미 무료면 체크 안 함
-    if not subscription.is_premium:
-        return
-    
-    # expires_at 없으면 영구 프리미엄
-    if subscription.expires_at is None:
-        return
-    
-    # 만료 체크
-    now = datetime.now(timezone.utc)
-    if now >= subscription.expires_at:
-        # 자동 만료 처리
-        subscription.is_premium = False
-        subscription.plan_type = None
-        subscription.expires_at = None
-        await session.commit()
-        await session.refresh(subscription)
+    if not is_premium:
+        return False
+    if expires_at is None:
+        return True
+    return (now or datetime.now(timezone.utc)) < expires_at
+
+
+async def expire_due_subscriptions(session: AsyncSession) -> list[str]:
+    """
+    만료 시각이 지난 프리미엄 구독을 한 번에 만료 처리하고 해당 user_id 목록 반환.
+    (ix_subscriptions_premium_expires_at 부분 인덱스 사용)
+    """
+    result = await session.execute(
+        update(Subscription)
+        .where(Subscription.is_premium.is_(True))
+        .where(Subscription.expires_at <= func.now())
+        .values(is_premium=False, plan_type=None, expires_at=None)
+        .returning(Subscription.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    user_ids = list(result.scalars())
+    await session.commit()
+
+    for user_id in user_ids:
+        invalidate_subscription_status(user_id)
+        get_usage_counter().invalidate(user_id)
+    return user_ids
+
+
+async def _run_expiry_sweeper(interval: float) -> None:
+    while True:
+        try:
+            async with AsyncSessionLocal() as session:
+                expired = await expire_due_subscriptions(session)
+            _sweeper_stats["runs"] += 1
+            _sweeper_stats["expired"] += len(expired)
+            if expired:
+                logger.info(f"Expired {len(expired)} subscriptions")
+        except Exception:
+            _sweeper_stats["failures"] += 1
+            logger.exception("Subscription expiry sweep failed")
+        await asyncio.sleep(interval)
+
+
+def start_expiry_sweeper() -> None:
+    """
+    앱 시작 시 만료 스위퍼 시작 (SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL마다 한 번).
+    """
+    global _sweeper_task
+
+    if _sweeper_task is None and SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL > 0:
+        _sweeper_task = asyncio.create_task(
+            _run_expiry_sweeper(SUBSCRIPTION_EXPIRY_SWEEP_INTERVAL)
+        )
+
+
+async def stop_expiry_sweeper() -> None:
+    global _sweeper_task
+
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        try:
+            await _sweeper_task
+        except asyncio.CancelledError:
+            pass
+        _sweeper_task = None
+
 
 async def check_and_increment_usage(
     session: AsyncSession,
@@ -95,58 +238,14 @@ async def check_and_increment_usage(
     """
     사용량 체크 및 증가
     
-    1. Subscription 조회
-    2. 만료 체크 및 자동 처리 ✅ 추가
-    3. 날짜 체크 및 리셋
-    4. 무료 사용자 제한 체크
-    5. 카운터 +1
-    6. 사용량 정보 반환
+    실제 처리는 USAGE_COUNTER_BACKEND에 따른 카운터 백엔드가 담당
+    (db: UPDATE ... RETURNING 한 번 / memory: 프로세스 메모리 + 주기적 일괄 반영)
     
     Returns:
-        UsageInfo: 남은 횟수, 제한, 프리미엄 여부
+        UsageInfo: 남은 횟수, 제한, 프리미엄 여부 (라우터는 is_premium으로 모델 선택)
         
     Raises:
         HTTPException(429): 무료 사용자 일일 한도 초과
         HTTPException(404): 구독 정보 없음
     """
-    # 1. Subscription 조회
-    subscription = await get_subscription_by_user_id(session, user_id)
-    if subscription is None:
-        raise HTTPException(
-            status_code=404,
-            detail="구독 정보를 찾을 수 없어요.",
-        )
-    
-    # 2. 만료 체크 및 자동 처리 ✅ 여기 추가!
-    await check_and_update_subscription_status(session, subscription)
-    
-    today = date.today()
-    
-    # 3. 날짜 체크 및 리셋 (기존)
-    if subscription.last_reset_date != today:
-        subscription.daily_usage_count = 0
-        subscription.last_reset_date = today
-    
-    # 4. 무료 사용자 제한 체크 (기존)
-    if not subscription.is_premium and subscription.daily_usage_count >= 5:
-        raise HTTPException(
-            status_code=429,
-            detail="오늘의 무료 사용 횟수를 모두 사용했어요. 프리미엄으로 업그레이드하거나 내일 다시 시도해주세요!",
-        )
-    
-    # 5. 카운터 증가 (기존)
-    subscription.daily_usage_count += 1
-    
-    # 6. DB 커밋 (기존)
-    await session.commit()
-    await session.refresh(subscription)
-    
-    # 7. 사용량 정보 반환 (기존)
-    if subscription.is_premium:
-        return UsageInfo(remaining=-1, limit=-1, is_premium=True)
-    else:
-        return UsageInfo(
-            remaining=5 - subscription.daily_usage_count,
-            limit=5,
-            is_premium=False,
-        )
\ No newline at end of file
+    return await get_usage_counter().check_and_increment(session, user_id)
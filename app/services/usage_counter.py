@@ -0,0 +1,493 @@
+# app/services/usage_counter.py
+"""
+일일 사용량 카운터 백엔드
+
+- DatabaseUsageCounter: 요청마다 UPDATE ... RETURNING 한 번 (여러 프로세스에서도 정확)
+- InMemoryUsageCounter: 프로세스 메모리에서 세고, 모인 증가분을 주기적으로 한 번에 DB 반영
+  (write-behind, subscriptions 테이블 쓰기 부하 감소)
+
+InMemoryUsageCounter의 한도 보장 범위:
+    한 프로세스 안에서는 정확히 FREE_DAILY_LIMIT회.
+    N개 프로세스(uvicorn 워커 / 인스턴스)가 떠 있으면 각 프로세스가 자기 몫을 따로 세므로
+    하루 최대 N × FREE_DAILY_LIMIT회까지 허용될 수 있음.
+    (다른 프로세스가 반영한 사용량은 항목 재조회 시 보이므로 실제로는 보통 그보다 적음)
+    여러 인스턴스로 확장할 때 정확한 한도가 필요하면 USAGE_COUNTER_BACKEND=db 사용.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Protocol
+
+from fastapi import HTTPException
+from sqlalchemy import and_, bindparam, case, false, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import (
+    USAGE_COUNTER_BACKEND,
+    USAGE_COUNTER_FLUSH_INTERVAL,
+    USAGE_COUNTER_FLUSH_BATCH_SIZE,
+    USAGE_COUNTER_REFRESH_SECONDS,
+    USAGE_COUNTER_SHARDS,
+)
+from app.models import Subscription
+from app.schemas.rizz import UsageInfo
+from app.services.metrics import register_metrics
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger("syrano")
+
+# 무료 사용자 일일 생성 한도
+FREE_DAILY_LIMIT = 5
+
+
+def _subscription_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail="구독 정보를 찾을 수 없어요.",
+    )
+
+
+def _daily_limit_exceeded() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="오늘의 무료 사용 횟수를 모두 사용했어요. 프리미엄으로 업그레이드하거나 내일 다시 시도해주세요!",
+    )
+
+
+def _usage_info(is_premium: bool, usage_count: int) -> UsageInfo:
+    if is_premium:
+        return UsageInfo(remaining=-1, limit=-1, is_premium=True)
+    return UsageInfo(
+        remaining=FREE_DAILY_LIMIT - usage_count,
+        limit=FREE_DAILY_LIMIT,
+        is_premium=False,
+    )
+
+
+class UsageCounter(Protocol):
+    """
+    사용량 카운터 프로토콜.
+    """
+
+    async def check_and_increment(self, session: AsyncSession, user_id: str) -> UsageInfo:
+        """
+        한도 체크 후 오늘 사용량 +1.
+
+        Raises:
+            HTTPException(429): 무료 사용자 일일 한도 초과
+            HTTPException(404): 구독 정보 없음
+        """
+        ...
+
+    def invalidate(self, user_id: str) -> None:
+        """구독 상태가 바뀐 경우(결제 등) 캐시된 상태 무효화."""
+        ...
+
+    async def start(self) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class DatabaseUsageCounter:
+    """
+    요청마다 조건부 UPDATE ... RETURNING 한 문장으로 처리.
+
+    한 문장 안에서 원자적으로:
+    1. 만료 체크 (만료된 프리미엄은 무료로 취급, DB 만료 처리는 스위퍼가 담당)
+    2. 날짜 체크 및 리셋
+    3. 무료 사용자 제한 체크 (WHERE 조건 → 동시 요청도 한도를 넘지 못함)
+    4. 카운터 +1
+
+    갱신된 행이 없을 때만 한 번 더 조회해서 404 / 429 구분.
+    """
+
+    async def check_and_increment(self, session: AsyncSession, user_id: str) -> UsageInfo:
+        now = datetime.now(timezone.utc)
+        today = date.today()
+
+        expired = and_(
+            Subscription.is_premium.is_(True),
+            Subscription.expires_at.is_not(None),
+            Subscription.expires_at <= now,
+        )
+        is_premium = case((expired, false()), else_=Subscription.is_premium)
+        is_new_day = or_(
+            Subscription.last_reset_date.is_(None),
+            Subscription.last_reset_date != today,
+        )
+        usage_count = case((is_new_day, 0), else_=Subscription.daily_usage_count)
+
+        stmt = (
+            update(Subscription)
+            .where(Subscription.user_id == user_id)
+            .where(or_(is_premium.is_(True), usage_count < FREE_DAILY_LIMIT))
+            .values(
+                daily_usage_count=usage_count + 1,
+                last_reset_date=today,
+            )
+            .returning(is_premium.label("is_premium"), Subscription.daily_usage_count)
+            .execution_options(synchronize_session=False)
+        )
+        row = (await session.execute(stmt)).one_or_none()
+        await session.commit()
+
+        if row is None:
+            # 갱신 실패 → 구독이 없거나 오늘 한도 초과
+            exists = await session.scalar(
+                select(Subscription.id).where(Subscription.user_id == user_id)
+            )
+            if exists is None:
+                raise _subscription_not_found()
+            raise _daily_limit_exceeded()
+
+        return _usage_info(row.is_premium, row.daily_usage_count)
+
+    def invalidate(self, user_id: str) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass
+class _UsageEntry:
+    user_id: str
+    day: date
+    # DB에 반영된 오늘 사용량
+    base: int
+    # 아직 DB에 반영 안 된 증가분 / 지금 반영 중인 증가분
+    pending: int
+    flushing: int
+    is_premium: bool
+    expires_at: datetime | None
+    loaded_at: float
+
+    @property
+    def count(self) -> int:
+        return self.base + self.flushing + self.pending
+
+    def premium_at(self, now: datetime) -> bool:
+        return self.is_premium and (self.expires_at is None or now < self.expires_at)
+
+
+# 모인 증가분 일괄 반영 (executemany).
+# 날짜가 바뀐 뒤 늦게 도착한 이전 날짜 증가분은 오늘 값을 덮어쓰지 않도록 WHERE로 제외.
+_subscriptions = Subscription.__table__
+_FLUSH_STMT = (
+    update(_subscriptions)
+    .where(_subscriptions.c.user_id == bindparam("b_user_id"))
+    .where(
+        or_(
+            _subscriptions.c.last_reset_date.is_(None),
+            _subscriptions.c.last_reset_date <= bindparam("b_day"),
+        )
+    )
+    .values(
+        daily_usage_count=case(
+            (
+                _subscriptions.c.last_reset_date == bindparam("b_day"),
+                _subscriptions.c.daily_usage_count + bindparam("b_delta"),
+            ),
+            else_=bindparam("b_delta"),
+        ),
+        last_reset_date=bindparam("b_day"),
+    )
+)
+
+
+class InMemoryUsageCounter:
+    """
+    프로세스 메모리 카운터 + 주기적 일괄 반영 (write-behind).
+
+    - 유저별 항목을 user_id 해시로 샤드에 나눠 보관
+    - 처음 보는 유저 / refresh_seconds 지난 항목은 DB에서 다시 읽음
+      (다른 프로세스가 반영한 사용량, 결제로 바뀐 프리미엄 상태 반영)
+    - 한도 체크와 +1 사이에 await가 없어서 프로세스 안에서는 동시 요청도 한도를 넘지 못함
+    - 무료 한도에 걸리면 DB에서 한 번 더 읽고 다시 판단 (방금 결제한 경우 등)
+    - flush_interval마다, 그리고 종료 시 증가분을 batch_size씩 UPDATE executemany
+    - 프리미엄 만료는 메모리에서만 판단 (DB 만료 처리는 스위퍼가 담당)
+    """
+
+    # 한도에 걸렸을 때 DB를 다시 읽는 최소 간격
+    LIMIT_RECHECK_SECONDS = 1.0
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        shards: int,
+        flush_interval: float,
+        batch_size: int,
+        refresh_seconds: float,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.refresh_seconds = refresh_seconds
+        self._shards: list[dict[str, _UsageEntry]] = [{} for _ in range(max(1, shards))]
+        self._loads: SingleFlight[str, _UsageEntry | None] = SingleFlight()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+        # 날짜가 바뀌어 샤드에서 빠졌지만 이전 날짜 증가분 반영에 실패한 항목 (다음 flush에서 재시도)
+        self._retired: list[_UsageEntry] = []
+
+        self.increments = 0
+        self.rejections = 0
+        self.loads = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.flush_failures = 0
+        self.last_flush_seconds = 0.0
+
+    async def check_and_increment(self, session: AsyncSession, user_id: str) -> UsageInfo:
+        today = date.today()
+        entry = self._shard(user_id).get(user_id)
+        if (
+            entry is None
+            or entry.day != today
+            or time.monotonic() - entry.loaded_at >= self.refresh_seconds
+        ):
+            entry = await self._load(user_id)
+
+        now = datetime.now(timezone.utc)
+        if not entry.premium_at(now) and entry.count >= FREE_DAILY_LIMIT:
+            # 한도에 걸렸을 때만 DB 재확인 (방금 결제 / 다른 프로세스 상태)
+            if time.monotonic() - entry.loaded_at > self.LIMIT_RECHECK_SECONDS:
+                entry = await self._load(user_id)
+            if not entry.premium_at(now) and entry.count >= FREE_DAILY_LIMIT:
+                self.rejections += 1
+                raise _daily_limit_exceeded()
+
+        entry.pending += 1
+        self.increments += 1
+        is_premium = entry.premium_at(now)
+        return _usage_info(is_premium, entry.count)
+
+    def invalidate(self, user_id: str) -> None:
+        entry = self._shard(user_id).get(user_id)
+        if entry is not None:
+            entry.loaded_at = 0.0
+
+    async def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        # 종료 시 남은 증가분 반영
+        await self.flush()
+
+    async def flush(self) -> int:
+        """모인 증가분을 DB에 반영하고 반영한 행 수를 반환. 실패한 증가분은 다음에 다시 시도."""
+        async with self._flush_lock:
+            started = time.monotonic()
+            entries = [entry for shard in self._shards for entry in shard.values()]
+            batch = self._take_pending(entries + self._retired)
+            flushed = await self._write(batch)
+            self._retired = [entry for entry in self._retired if entry.pending]
+
+            self._evict_idle()
+            if batch:
+                self.flushes += 1
+                self.flushed_rows += flushed
+                self.last_flush_seconds = round(time.monotonic() - started, 4)
+            return flushed
+
+    def stats(self) -> dict:
+        entries = [entry for shard in self._shards for entry in shard.values()]
+        return {
+            "backend": "memory",
+            "shards": len(self._shards),
+            "users_tracked": len(entries),
+            "pending_increments": sum(e.pending + e.flushing for e in entries + self._retired),
+            "increments": self.increments,
+            "rejections": self.rejections,
+            "loads": self.loads,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "flush_failures": self.flush_failures,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+    @staticmethod
+    def _take_pending(entries: list[_UsageEntry]) -> list[_UsageEntry]:
+        """반영할 증가분이 있는 항목을 골라 pending → flushing으로 옮김. (flush 락 안에서 호출)"""
+        batch: list[_UsageEntry] = []
+        for entry in entries:
+            if entry.pending:
+                entry.flushing, entry.pending = entry.pending, 0
+                batch.append(entry)
+        return batch
+
+    async def _write(self, batch: list[_UsageEntry]) -> int:
+        """batch_size씩 UPDATE executemany. 실패한 묶음의 증가분은 pending으로 되돌림."""
+        flushed = 0
+        for offset in range(0, len(batch), self.batch_size):
+            chunk = batch[offset:offset + self.batch_size]
+            params = [
+                {"b_user_id": e.user_id, "b_day": e.day, "b_delta": e.flushing}
+                for e in chunk
+            ]
+            try:
+                async with self.session_factory() as session:
+                    await session.execute(_FLUSH_STMT, params)
+                    await session.commit()
+            except Exception:
+                logger.exception(f"Failed to flush usage counters ({len(chunk)} users)")
+                self.flush_failures += 1
+                for e in chunk:
+                    e.pending += e.flushing
+                    e.flushing = 0
+                continue
+
+            for e in chunk:
+                e.base += e.flushing
+                e.flushing = 0
+            flushed += len(chunk)
+        return flushed
+
+    async def _flush_previous_day(self, entry: _UsageEntry) -> None:
+        """
+        날짜가 바뀌어 교체될 항목의 미반영 증가분을 교체 전에 반영.
+        (flush 락을 잡으므로 진행 중인 반영이 끝난 뒤 남은 pending만 반영, 실패하면 _retired로 재시도)
+        """
+        async with self._flush_lock:
+            await self._write(self._take_pending([entry]))
+            if entry.pending:
+                self._retired.append(entry)
+
+    def _shard(self, user_id: str) -> dict[str, _UsageEntry]:
+        return self._shards[zlib.crc32(user_id.encode()) % len(self._shards)]
+
+    async def _load(self, user_id: str) -> _UsageEntry:
+        # 같은 유저의 동시 첫 요청은 조회 한 번만 (요청 세션과 별개인 짧은 세션 사용)
+        entry = await self._loads.do(user_id, lambda: self._read(user_id))
+        if entry is None:
+            raise _subscription_not_found()
+        return entry
+
+    async def _read(self, user_id: str) -> _UsageEntry | None:
+        self.loads += 1
+        async with self.session_factory() as session:
+            row = (
+                await session.execute(
+                    select(
+                        Subscription.is_premium,
+                        Subscription.expires_at,
+                        Subscription.daily_usage_count,
+                        Subscription.last_reset_date,
+                    ).where(Subscription.user_id == user_id)
+                )
+            ).one_or_none()
+        if row is None:
+            return None
+
+        today = date.today()
+        db_count = row.daily_usage_count if row.last_reset_date == today else 0
+        shard = self._shard(user_id)
+        entry = shard.get(user_id)
+
+        if entry is not None and entry.day != today and (entry.pending or entry.flushing):
+            # 이전 날짜 증가분을 버리지 않고 먼저 반영 (b_day가 이전 날짜라 오늘 값은 덮어쓰지 않음)
+            await self._flush_previous_day(entry)
+
+        if entry is None or entry.day != today:
+            # 이전 날짜 증가분은 위에서 반영했으므로 오늘 값으로 새로 시작
+            entry = shard[user_id] = _UsageEntry(
+                user_id=user_id,
+                day=today,
+                base=db_count,
+                pending=0,
+                flushing=0,
+                is_premium=row.is_premium,
+                expires_at=row.expires_at,
+                loaded_at=time.monotonic(),
+            )
+            return entry
+
+        # 기존 항목 갱신: 미반영 증가분은 유지, DB 값은 다른 프로세스 반영분까지 포함
+        # (반영 중인 증가분이 있으면 DB 값에 포함됐는지 알 수 없으므로 base는 그대로)
+        if entry.flushing == 0:
+            entry.base = max(entry.base, db_count)
+        entry.is_premium = row.is_premium
+        entry.expires_at = row.expires_at
+        entry.loaded_at = time.monotonic()
+        return entry
+
+    def _evict_idle(self) -> None:
+        """반영할 게 없고 오래 안 쓴 항목 제거 (다음 요청 때 다시 읽음)."""
+        now = time.monotonic()
+        today = date.today()
+        for shard in self._shards:
+            idle = [
+                user_id
+                for user_id, entry in shard.items()
+                if not entry.pending
+                and not entry.flushing
+                and (entry.day != today or now - entry.loaded_at >= self.refresh_seconds)
+            ]
+            for user_id in idle:
+                del shard[user_id]
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Usage counter flush loop error")
+
+
+# 앱 수명 동안 쓰는 카운터 (lifespan 전 / 스크립트에서는 DB 백엔드)
+_usage_counter: UsageCounter = DatabaseUsageCounter()
+
+
+def get_usage_counter() -> UsageCounter:
+    return _usage_counter
+
+
+async def init_usage_counter() -> None:
+    """
+    앱 시작 시 USAGE_COUNTER_BACKEND에 맞는 카운터 생성 (memory면 주기적 반영 시작).
+    """
+    global _usage_counter
+
+    if USAGE_COUNTER_BACKEND == "memory":
+        from app.db import AsyncSessionLocal
+
+        counter = InMemoryUsageCounter(
+            AsyncSessionLocal,
+            shards=USAGE_COUNTER_SHARDS,
+            flush_interval=USAGE_COUNTER_FLUSH_INTERVAL,
+            batch_size=USAGE_COUNTER_FLUSH_BATCH_SIZE,
+            refresh_seconds=USAGE_COUNTER_REFRESH_SECONDS,
+        )
+        register_metrics("usage_counter", counter.stats)
+        _usage_counter = counter
+    else:
+        _usage_counter = DatabaseUsageCounter()
+
+    await _usage_counter.start()
+
+
+async def close_usage_counter() -> None:
+    """
+    앱 종료 시 남은 증가분 반영.
+    """
+    await _usage_counter.close()
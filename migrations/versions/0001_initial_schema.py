@@ -0,0 +1,101 @@
+"""initial schema (users, subscriptions, message_history, profiles)
+
+기존에 init_db()의 create_all로 만들어진 스키마와 동일.
+이미 테이블이 있는 DB는 `alembic stamp 0001` 후 `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    op.create_table(
+        "subscriptions",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.String(length=36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("is_premium", sa.Boolean(), nullable=False),
+        sa.Column("plan_type", sa.String(length=32), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("daily_usage_count", sa.Integer(), nullable=False),
+        sa.Column("last_reset_date", sa.Date(), nullable=True),
+    )
+    op.create_index("ix_subscriptions_user_id", "subscriptions", ["user_id"], unique=True)
+
+    op.create_table(
+        "message_history",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.String(length=36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("conversation", sa.Text(), nullable=False),
+        sa.Column("suggestions", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_message_history_user_id", "message_history", ["user_id"])
+
+    op.create_table(
+        "profiles",
+        sa.Column("id", sa.String(length=36), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.String(length=36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("gender", sa.String(length=10), nullable=True),
+        sa.Column("memo", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("idx_profiles_user_id", "profiles", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_profiles_user_id", table_name="profiles")
+    op.drop_table("profiles")
+    op.drop_index("ix_message_history_user_id", table_name="message_history")
+    op.drop_table("message_history")
+    op.drop_index("ix_subscriptions_user_id", table_name="subscriptions")
+    op.drop_table("subscriptions")
+    op.drop_table("users")
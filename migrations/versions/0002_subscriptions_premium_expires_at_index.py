@@ -0,0 +1,43 @@
+"""partial index for the subscription expiry sweeper
+
+프리미엄 구독의 expires_at 부분 인덱스.
+운영 중인 테이블을 잠그지 않도록 CREATE INDEX CONCURRENTLY (트랜잭션 밖에서 실행).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_subscriptions_premium_expires_at",
+            "subscriptions",
+            ["expires_at"],
+            postgresql_where=sa.text("is_premium"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_subscriptions_premium_expires_at",
+            table_name="subscriptions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,67 @@
+"""native UUID primary/foreign keys
+
+VARCHAR(36) → UUID (16바이트). 기존 uuid4 문자열은 그대로 캐스팅하고,
+새 행부터 앱에서 UUIDv7(시간순)로 생성.
+
+FK를 잠시 끊고 PK/FK 컬럼 타입을 바꾼 뒤 같은 이름으로 다시 연결.
+ALTER COLUMN TYPE은 테이블을 다시 쓰므로(ACCESS EXCLUSIVE 락) 트래픽이 적을 때 실행.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# users.id를 참조하는 테이블 (FK 이름은 Postgres 기본 이름 <table>_<column>_fkey)
+CHILD_TABLES = ("subscriptions", "message_history", "profiles")
+
+
+def _convert(column_type: sa.types.TypeEngine, cast: str) -> None:
+    for table in CHILD_TABLES:
+        op.drop_constraint(f"{table}_user_id_fkey", table, type_="foreignkey")
+
+    for table in ("users", *CHILD_TABLES):
+        op.alter_column(
+            table,
+            "id",
+            type_=column_type,
+            postgresql_using=f"id::{cast}",
+        )
+    for table in CHILD_TABLES:
+        op.alter_column(
+            table,
+            "user_id",
+            type_=column_type,
+            postgresql_using=f"user_id::{cast}",
+        )
+
+    for table in CHILD_TABLES:
+        op.create_foreign_key(
+            f"{table}_user_id_fkey",
+            table,
+            "users",
+            ["user_id"],
+            ["id"],
+            ondelete="CASCADE",
+        )
+
+
+def upgrade() -> None:
+    _convert(postgresql.UUID(as_uuid=False), "uuid")
+
+
+def downgrade() -> None:
+    _convert(sa.String(length=36), "varchar(36)")
@@ -0,0 +1,124 @@
+"""monthly range partitions for message_history
+
+message_history를 created_at 기준 월별 RANGE 파티션 테이블로 교체.
+
+- PK (id, created_at) (파티션 키가 PK에 포함돼야 함)
+- (user_id, created_at DESC, id DESC) 인덱스 → 유저별 최신순 keyset 페이지 조회
+- 기존 데이터가 있는 달 ~ 이번 달 + 2개월 파티션 + DEFAULT 파티션(범위 밖 행 안전망)
+- 이후 달 파티션 생성 / 오래된 파티션 삭제는 앱의 유지보수 태스크가 담당
+  (app/services/message_history.py)
+
+기존 행을 새 테이블로 복사하므로 기록이 많으면 트래픽이 적을 때 실행.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey(
+                "users.id",
+                name="message_history_user_id_fkey",
+                ondelete="CASCADE",
+            ),
+            nullable=False,
+        ),
+        sa.Column("conversation", sa.Text(), nullable=False),
+        sa.Column("suggestions", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def _rename_legacy() -> None:
+    op.rename_table("message_history", "message_history_legacy")
+    op.execute("ALTER INDEX message_history_pkey RENAME TO message_history_legacy_pkey")
+    op.execute(
+        "ALTER TABLE message_history_legacy "
+        "RENAME CONSTRAINT message_history_user_id_fkey TO message_history_legacy_user_id_fkey"
+    )
+
+
+def upgrade() -> None:
+    _rename_legacy()
+    op.drop_index("ix_message_history_user_id", table_name="message_history_legacy")
+
+    op.create_table(
+        "message_history",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="message_history_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_message_history_user_id_created_at",
+        "message_history",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+    # 기존 데이터가 있는 첫 달 ~ 이번 달 + 2개월 (경계는 UTC 월 시작)
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month_start timestamp;
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months';
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), now()) AT TIME ZONE 'UTC')
+              INTO month_start
+              FROM message_history_legacy;
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF message_history FOR VALUES FROM (%L) TO (%L)',
+                    'message_history_p' || to_char(month_start, 'YYYYMM'),
+                    month_start AT TIME ZONE 'UTC',
+                    (month_start + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute("CREATE TABLE message_history_default PARTITION OF message_history DEFAULT")
+
+    op.execute(
+        "INSERT INTO message_history (id, user_id, conversation, suggestions, created_at) "
+        "SELECT id, user_id, conversation, suggestions, created_at FROM message_history_legacy"
+    )
+    op.drop_table("message_history_legacy")
+
+
+def downgrade() -> None:
+    _rename_legacy()
+
+    op.create_table(
+        "message_history",
+        *_columns(),
+        sa.PrimaryKeyConstraint("id", name="message_history_pkey"),
+    )
+    op.create_index("ix_message_history_user_id", "message_history", ["user_id"])
+
+    op.execute(
+        "INSERT INTO message_history (id, user_id, conversation, suggestions, created_at) "
+        "SELECT id, user_id, conversation, suggestions, created_at FROM message_history_legacy"
+    )
+    # 파티션도 같이 삭제됨
+    op.drop_table("message_history_legacy")
@@ -0,0 +1,60 @@
+"""composite covering index for paginated profile lists
+
+idx_profiles_user_id(user_id) → ix_profiles_user_id_created_at
+(user_id, created_at DESC, id DESC) INCLUDE (name, age, gender, updated_at)
+
+GET /profiles 최신순 커서 조회를 정렬 없이 인덱스 순서대로 읽고,
+memo 없는 summary 목록은 테이블을 읽지 않음(index-only scan).
+새 인덱스가 user_id 단독 조회도 대신하므로 기존 인덱스는 삭제.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_profiles_user_id_created_at",
+            "profiles",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_include=["name", "age", "gender", "updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "idx_profiles_user_id",
+            table_name="profiles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_profiles_user_id",
+            "profiles",
+            ["user_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_profiles_user_id_created_at",
+            table_name="profiles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,94 @@
+"""
+OCR 전처리 전/후 페이로드 크기 및 OCR 소요 시간 비교 벤치마크
+
+사용법:
+    python scripts/bench_ocr_preprocess.py screenshot1.png screenshot2.png
+    python scripts/bench_ocr_preprocess.py --ocr screenshot1.png   # 실제 Clova 호출 포함 (.env 필요)
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.ocr.base import normalize_image_format  # noqa: E402
+from app.services.ocr.preprocess import PreprocessOptions, preprocess_image  # noqa: E402
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:,.1f} KB"
+
+
+async def _timed_ocr(service, image_data: bytes, image_format: str) -> tuple[float, int]:
+    started = time.perf_counter()
+    text = await service.extract_text_from_bytes(image_data, image_format)
+    return time.perf_counter() - started, len(text)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="+", type=Path)
+    parser.add_argument("--max-dimension", type=int, default=2048)
+    parser.add_argument("--format", default="jpeg", choices=["jpeg", "png"])
+    parser.add_argument("--quality", type=int, default=85)
+    parser.add_argument("--crop-top", type=float, default=0.0)
+    parser.add_argument("--crop-bottom", type=float, default=0.0)
+    parser.add_argument("--ocr", action="store_true", help="실제 Clova OCR 호출 시간까지 측정")
+    args = parser.parse_args()
+
+    options = PreprocessOptions(
+        max_dimension=args.max_dimension,
+        output_format=args.format,
+        quality=args.quality,
+        crop_top_ratio=args.crop_top,
+        crop_bottom_ratio=args.crop_bottom,
+    )
+
+    ocr_service = None
+    client = None
+    if args.ocr:
+        # 캐시/전처리 없는 순수 Clova 호출끼리 비교
+        from app.config import NAVER_OCR_SECRET_KEY, NAVER_OCR_INVOKE_URL
+        from app.services.ocr.factory import create_ocr_http_client
+        from app.services.ocr.naver import NaverOCRService
+
+        client = create_ocr_http_client()
+        ocr_service = NaverOCRService(
+            secret_key=NAVER_OCR_SECRET_KEY,
+            invoke_url=NAVER_OCR_INVOKE_URL,
+            client=client,
+        )
+
+    try:
+        for path in args.images:
+            original = path.read_bytes()
+            original_format = normalize_image_format(filename=str(path))
+
+            started = time.perf_counter()
+            processed, processed_format = preprocess_image(original, original_format, options)
+            preprocess_ms = (time.perf_counter() - started) * 1000
+
+            original_b64 = len(base64.b64encode(original))
+            processed_b64 = len(base64.b64encode(processed))
+
+            print(f"== {path.name}")
+            print(f"  raw     : {_kb(len(original))} ({original_format}) → {_kb(len(processed))} ({processed_format})")
+            print(f"  base64  : {_kb(original_b64)} → {_kb(processed_b64)} ({processed_b64 / original_b64:.0%})")
+            print(f"  preprocess: {preprocess_ms:.1f} ms")
+
+            if ocr_service is not None:
+                before_s, before_chars = await _timed_ocr(ocr_service, original, original_format)
+                after_s, after_chars = await _timed_ocr(ocr_service, processed, processed_format)
+                print(f"  ocr     : {before_s * 1000:.0f} ms ({before_chars} chars) → {after_s * 1000:.0f} ms ({after_chars} chars)")
+    finally:
+        if client is not None:
+            await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
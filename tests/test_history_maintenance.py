@@ -0,0 +1,88 @@
+# tests/test_history_maintenance.py
+"""
+run_history_maintenance: 파티션 생성 / 만료 파티션 삭제 / DEFAULT 만료 행 삭제가
+각각 별도 트랜잭션이라 한 단계가 실패해도 다른 단계는 진행되는지 확인.
+
+실제 DDL은 PostgreSQL 전용이라 단계 함수는 스텁으로 대체.
+"""
+import pytest
+
+from app.services import message_history
+
+
+class FakeSession:
+    def __init__(self, log: list[str]):
+        self.log = log
+
+    async def __aenter__(self):
+        self.log.append("begin")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.log.append("end")
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+@pytest.fixture
+def maintenance(monkeypatch):
+    log: list[str] = []
+    stats = {key: 0 for key in message_history._maintenance_stats}
+    monkeypatch.setattr(message_history, "_maintenance_stats", stats)
+    monkeypatch.setattr(message_history, "MESSAGE_HISTORY_PARTITIONS_AHEAD", 1)
+    monkeypatch.setattr(message_history, "MESSAGE_HISTORY_RETENTION_MONTHS", 12)
+    monkeypatch.setattr(message_history, "_DEFAULT_PURGE_BATCH_SIZE", 10)
+
+    async def locked(session):
+        return True
+
+    monkeypatch.setattr(message_history, "_try_maintenance_lock", locked)
+    return log, stats, (lambda: FakeSession(log))
+
+
+async def test_failed_creation_does_not_block_retention(maintenance, monkeypatch):
+    log, stats, session_factory = maintenance
+
+    async def fail_create(session, month):
+        raise RuntimeError("partition overlaps DEFAULT rows")
+
+    async def drop(session, retention_months):
+        log.append("drop")
+        return ["message_history_p202401"]
+
+    purge_sizes = iter([10, 3])
+
+    async def purge(session, retention_months, limit):
+        log.append("purge")
+        return next(purge_sizes)
+
+    monkeypatch.setattr(message_history, "create_history_partition", fail_create)
+    monkeypatch.setattr(message_history, "drop_expired_history_partitions", drop)
+    monkeypatch.setattr(message_history, "purge_expired_default_rows", purge)
+
+    await message_history.run_history_maintenance(session_factory)
+
+    assert stats["failures"] == 2  # 이번 달 + 다음 달 생성 실패
+    assert stats["dropped"] == 1
+    # 배치가 가득 차면 다음 배치, 덜 차면 멈춤 (배치마다 commit)
+    assert stats["purged_from_default"] == 13
+    assert log.count("purge") == 2
+    assert log.count("commit") == 3  # 삭제 1 + 배치 2 (실패한 생성은 commit 없음)
+
+
+async def test_moved_rows_are_counted(maintenance, monkeypatch):
+    log, stats, session_factory = maintenance
+    monkeypatch.setattr(message_history, "MESSAGE_HISTORY_RETENTION_MONTHS", 0)
+    results = iter([None, 7])  # 이번 달은 이미 있음, 다음 달은 DEFAULT에서 7행 이동
+
+    async def create(session, month):
+        return next(results)
+
+    monkeypatch.setattr(message_history, "create_history_partition", create)
+
+    await message_history.run_history_maintenance(session_factory)
+
+    assert stats["created"] == 1
+    assert stats["moved_from_default"] == 7
+    assert log.count("commit") == 2
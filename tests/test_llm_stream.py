@@ -0,0 +1,73 @@
+# tests/test_llm_stream.py
+"""
+stream_suggestions_from_conversation: 필요한 줄을 다 받거나 소비자가 끊으면
+OpenAI 스트림을 바로 닫고 스케줄러 슬롯을 반납하는지 확인.
+"""
+import asyncio
+
+import pytest
+
+from app.schemas.rizz import UsageInfo
+from app.services import llm
+from app.services.rizz_context import RizzContext
+
+MODEL = "test-stream-model"
+
+
+class _Chunk:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeStreamingLLM:
+    """끝없이 한 줄씩 보내는 astream, 닫히면 closed 기록."""
+
+    model_name = MODEL
+
+    def __init__(self):
+        self.closed = False
+
+    async def astream(self, messages):
+        try:
+            index = 0
+            while True:
+                yield _Chunk(f"답장 {index}\n")
+                index += 1
+                await asyncio.sleep(0)
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def fake_llm(monkeypatch) -> FakeStreamingLLM:
+    fake = FakeStreamingLLM()
+    monkeypatch.setattr(llm, "get_llm", lambda is_premium=False: fake)
+    return fake
+
+
+def _stream(conversation: str):
+    context = RizzContext(
+        user_id="user",
+        usage_info=UsageInfo(remaining=4, limit=5, is_premium=False),
+    )
+    return llm.stream_suggestions_from_conversation(
+        conversation=conversation, context=context, num_suggestions=3, fresh=True
+    )
+
+
+async def test_stream_closes_upstream_after_enough_lines(fake_llm):
+    suggestions = [line async for line in _stream("다 받기")]
+
+    assert suggestions == ["답장 0", "답장 1", "답장 2"]
+    assert fake_llm.closed
+    assert llm.get_scheduler(MODEL).stats()["active"] == 0
+
+
+async def test_stream_closes_upstream_when_consumer_disconnects(fake_llm):
+    stream = _stream("중간에 끊기")
+    assert await anext(stream) == "답장 0"
+
+    await stream.aclose()
+
+    assert fake_llm.closed
+    assert llm.get_scheduler(MODEL).stats()["active"] == 0
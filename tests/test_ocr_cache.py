@@ -0,0 +1,73 @@
+# tests/test_ocr_cache.py
+"""
+CachedOCRService 디스크 캐시: 설정별 키 분리 / 시작 시 만료 파일 정리 / 파일 수 상한
+"""
+import asyncio
+import os
+import time
+
+from app.services.cache import TTLCache
+from app.services.ocr.cache import CachedOCRService, cache_namespace
+
+
+class CountingOCR:
+    """호출 수를 세고 이미지 바이트를 그대로 텍스트로 돌려주는 내부 OCRService."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def extract_text(self, image_path):
+        raise NotImplementedError
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        self.calls += 1
+        return image_data.decode()
+
+
+def _cached(inner, disk_dir, **kwargs) -> CachedOCRService:
+    return CachedOCRService(
+        inner=inner,
+        memory_cache=TTLCache(max_entries=16, ttl_seconds=3600),
+        disk_dir=disk_dir,
+        **kwargs,
+    )
+
+
+async def test_changed_settings_do_not_reuse_disk_results(tmp_path):
+    inner = CountingOCR()
+    layout_on = cache_namespace(layout_aware=True, preprocess=None)
+    layout_off = cache_namespace(layout_aware=False, preprocess=None)
+    assert layout_on != layout_off
+
+    await _cached(inner, tmp_path, namespace=layout_on).extract_text_from_bytes(b"chat", "png")
+    # 재시작 후 같은 설정이면 디스크에서, 설정이 바뀌면 다시 OCR
+    await _cached(inner, tmp_path, namespace=layout_on).extract_text_from_bytes(b"chat", "png")
+    assert inner.calls == 1
+    await _cached(inner, tmp_path, namespace=layout_off).extract_text_from_bytes(b"chat", "png")
+    assert inner.calls == 2
+
+
+async def test_startup_sweep_removes_expired_files(tmp_path):
+    expired = tmp_path / "expired.txt"
+    expired.write_text("old", encoding="utf-8")
+    past = time.time() - 7200
+    os.utime(expired, (past, past))
+    (tmp_path / "fresh.txt").write_text("new", encoding="utf-8")
+
+    cached = _cached(CountingOCR(), tmp_path, disk_ttl_seconds=3600)
+
+    assert not expired.exists()
+    assert (tmp_path / "fresh.txt").exists()
+    assert cached.stats()["disk_entries"] == 1
+
+
+async def test_disk_tier_is_capped(tmp_path):
+    cached = _cached(CountingOCR(), tmp_path, disk_max_entries=10)
+
+    for index in range(15):
+        await cached.extract_text_from_bytes(f"image {index}".encode(), "png")
+        await asyncio.sleep(0)
+    await cached._sweep_task
+
+    assert len(list(tmp_path.glob("*.txt"))) <= 10
+    assert cached.stats()["disk_evictions"] > 0
@@ -0,0 +1,206 @@
+# tests/test_ocr_resilience.py
+"""
+ResilientOCRService: 데드라인 / 재시도 / 헤지 / 서킷 브레이커 / 재시도 예산
+
+가짜 Clova 서버(httpx.MockTransport) 또는 내부 OCRService 스텁으로 확인.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.ocr.base import OCRError, OCRUnavailableError
+from app.services.ocr.naver import NaverOCRService
+from app.services.ocr.resilience import CircuitBreaker, ResilientOCRService, RetryBudget
+
+IMAGE = b"fake-image-bytes"
+
+
+def _clova_response(text: str) -> httpx.Response:
+    return httpx.Response(200, json={"images": [{"fields": [{"inferText": text}]}]})
+
+
+class FakeClovaServer:
+    """요청마다 responses를 차례로 돌려주는 MockTransport 핸들러 (마지막 응답은 반복)."""
+
+    def __init__(self, *responses: httpx.Response):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        response = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        return response
+
+    def ocr_service(self) -> NaverOCRService:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self))
+        return NaverOCRService("secret", "http://ocr.test/invoke", client=client)
+
+
+class StubOCR:
+    """호출마다 behaviours의 코루틴 함수를 차례로 실행하는 내부 OCRService (마지막은 반복)."""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = 0
+
+    async def extract_text(self, image_path):
+        raise NotImplementedError
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        behaviour = self.behaviours[min(self.calls, len(self.behaviours) - 1)]
+        self.calls += 1
+        return await behaviour()
+
+
+def _returns(text: str):
+    async def behaviour() -> str:
+        return text
+    return behaviour
+
+
+def _sleeps(seconds: float, text: str = "slow"):
+    async def behaviour() -> str:
+        await asyncio.sleep(seconds)
+        return text
+    return behaviour
+
+
+def _raises(error: BaseException):
+    async def behaviour() -> str:
+        raise error
+    return behaviour
+
+
+def _resilient(inner, **overrides) -> ResilientOCRService:
+    options = dict(
+        attempt_timeout=1.0,
+        max_attempts=3,
+        backoff_base=0.0,
+        backoff_max=0.0,
+        retry_budget=RetryBudget(ratio=1.0, max_tokens=10.0),
+        breaker=CircuitBreaker(failure_threshold=5, recovery_seconds=60.0),
+        hedge_enabled=False,
+    )
+    options.update(overrides)
+    return ResilientOCRService(inner, **options)
+
+
+async def test_retryable_failure_is_retried():
+    server = FakeClovaServer(httpx.Response(503), _clova_response("안녕"))
+    service = _resilient(server.ocr_service())
+
+    assert await service.extract_text_from_bytes(IMAGE, "png") == "안녕"
+    assert server.calls == 2
+    assert service.retries == 1
+    assert service.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_bad_request_fails_fast_without_tripping_breaker():
+    server = FakeClovaServer(httpx.Response(400))
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=60.0)
+    service = _resilient(server.ocr_service(), breaker=breaker)
+
+    with pytest.raises(OCRError) as raised:
+        await service.extract_text_from_bytes(IMAGE, "png")
+
+    assert not isinstance(raised.value, OCRUnavailableError)
+    assert server.calls == 1
+    assert service.retries == 0
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.consecutive_failures == 0
+
+
+async def test_attempt_timeout_is_retried():
+    inner = StubOCR(_sleeps(1.0), _returns("늦지 않음"))
+    service = _resilient(inner, attempt_timeout=0.05)
+
+    assert await service.extract_text_from_bytes(IMAGE, "png") == "늦지 않음"
+    assert inner.calls == 2
+    assert service.failures == 1
+
+
+async def test_attempt_timeout_exhausts_attempts():
+    inner = StubOCR(_sleeps(1.0))
+    service = _resilient(inner, attempt_timeout=0.05, max_attempts=2)
+
+    with pytest.raises(OCRUnavailableError):
+        await service.extract_text_from_bytes(IMAGE, "png")
+    assert inner.calls == 2
+
+
+async def test_breaker_opens_then_recovers_through_half_open():
+    failure = _raises(OCRError("5xx", retryable=True))
+    release_trial = asyncio.Event()
+
+    async def held_success() -> str:
+        await release_trial.wait()
+        return "복구"
+
+    inner = StubOCR(failure, failure, held_success)
+    breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=0.05)
+    service = _resilient(inner, max_attempts=1, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(OCRUnavailableError):
+            await service.extract_text_from_bytes(IMAGE, "png")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # open: 내부 OCR을 호출하지 않고 바로 실패
+    with pytest.raises(OCRUnavailableError):
+        await service.extract_text_from_bytes(IMAGE, "png")
+    assert inner.calls == 2
+    assert service.rejected == 1
+
+    await asyncio.sleep(0.06)
+
+    # half_open: 시험 요청 하나만 통과, 그동안 다른 요청은 거절
+    trial = asyncio.create_task(service.extract_text_from_bytes(IMAGE, "png"))
+    await asyncio.sleep(0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(OCRUnavailableError):
+        await service.extract_text_from_bytes(IMAGE, "png")
+
+    release_trial.set()
+    assert await trial == "복구"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert inner.calls == 3
+
+
+async def test_hedge_fires_after_p95():
+    inner = StubOCR(_sleeps(1.0, "원 요청"), _returns("헤지 요청"))
+    service = _resilient(inner, hedge_enabled=True, hedge_min_delay=0.01)
+    service._latencies.extend([0.02] * service.MIN_LATENCY_SAMPLES)
+
+    started = time.monotonic()
+    assert await service.extract_text_from_bytes(IMAGE, "png") == "헤지 요청"
+    assert time.monotonic() - started < 0.5
+    assert service.hedges == 1
+    assert inner.calls == 2
+
+
+async def test_retry_budget_exhaustion_stops_retries():
+    server = FakeClovaServer(httpx.Response(503))
+    budget = RetryBudget(ratio=0.0, max_tokens=1.0)
+    service = _resilient(server.ocr_service(), max_attempts=5, retry_budget=budget)
+
+    with pytest.raises(OCRUnavailableError):
+        await service.extract_text_from_bytes(IMAGE, "png")
+    # 토큰 1개 → 재시도 1번만
+    assert server.calls == 2
+    assert service.retries == 1
+
+    with pytest.raises(OCRUnavailableError):
+        await service.extract_text_from_bytes(IMAGE, "png")
+    # 예산이 없으면 재시도 없이 바로 실패
+    assert server.calls == 3
+    assert service.retries == 1
+
+
+async def test_cancelled_inner_task_is_retried():
+    inner = StubOCR(_raises(asyncio.CancelledError()), _returns("재시도 성공"))
+    service = _resilient(inner)
+
+    assert await service.extract_text_from_bytes(IMAGE, "png") == "재시도 성공"
+    assert inner.calls == 2
@@ -0,0 +1,109 @@
+# tests/test_rizz_context.py
+"""
+load_rizz_context: 소유자 검증 프로필 조회 한 번 + 사용량 증가, 실패 시 사용량 차감 없음
+"""
+import dataclasses
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+
+from app.models import Subscription, User
+from app.services.rizz_context import RizzContext, load_rizz_context
+
+
+@pytest.fixture
+def statements(db_engine) -> list[str]:
+    """실행된 SQL 문 기록 (before_cursor_execute)"""
+    executed: list[str] = []
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany) -> None:
+        executed.append(" ".join(statement.split()).lower())
+
+    return executed
+
+
+def _profile_queries(executed: list[str]) -> list[str]:
+    return [s for s in executed if s.startswith("select") and "from profiles" in s]
+
+
+async def _usage_count(session_factory, user_id: str) -> int:
+    async with session_factory() as session:
+        return await session.scalar(
+            select(Subscription.daily_usage_count).where(Subscription.user_id == user_id)
+        )
+
+
+async def test_loads_owned_profile_with_one_query(owned_profile, statements, session_factory):
+    user_id, profile_id = owned_profile
+
+    context = await load_rizz_context(user_id, profile_id)
+
+    assert isinstance(context, RizzContext)
+    assert context.profile.id == profile_id
+    assert context.profile.name == "지수"
+    assert context.is_premium is False
+    assert context.usage_info.remaining == 4
+
+    # 왕복 횟수 고정: 소유자 검증 프로필 SELECT 한 번 + 사용량 UPDATE ... RETURNING 한 번
+    assert len(statements) == 2
+    profile_query, usage_update = statements
+    assert profile_query.startswith("select") and "from profiles" in profile_query
+    assert "profiles.id =" in profile_query
+    assert "profiles.user_id =" in profile_query
+    assert usage_update.startswith("update subscriptions")
+    assert await _usage_count(session_factory, user_id) == 1
+
+
+async def test_context_is_immutable(owned_profile):
+    context = await load_rizz_context(*owned_profile)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        context.profile.name = "다른 이름"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        context.profile = None
+
+
+async def test_without_profile_skips_profile_query(owned_profile, statements):
+    user_id, _ = owned_profile
+
+    context = await load_rizz_context(user_id, None)
+
+    assert context.profile is None
+    # 사용량 UPDATE 한 번만
+    assert len(statements) == 1
+    assert statements[0].startswith("update subscriptions")
+
+
+async def test_other_users_profile_is_404_without_using_credit(
+    owned_profile, statements, session_factory
+):
+    _, profile_id = owned_profile
+    async with session_factory() as session:
+        other = User()
+        session.add(other)
+        await session.flush()
+        session.add(Subscription(user_id=other.id))
+        await session.commit()
+        other_id = other.id
+    statements.clear()
+
+    with pytest.raises(HTTPException) as raised:
+        await load_rizz_context(other_id, profile_id)
+
+    assert raised.value.status_code == 404
+    # 프로필 SELECT 한 번에서 끝남 (사용량 UPDATE 없음)
+    assert len(statements) == 1
+    assert _profile_queries(statements) == statements
+    assert await _usage_count(session_factory, other_id) == 0
+
+
+async def test_missing_profile_is_404_without_using_credit(owned_profile, session_factory):
+    user_id, _ = owned_profile
+
+    with pytest.raises(HTTPException) as raised:
+        await load_rizz_context(user_id, "0192f7a8-b2c4-7d3e-8f00-000000000000")
+
+    assert raised.value.status_code == 404
+    assert await _usage_count(session_factory, user_id) == 0
@@ -0,0 +1,132 @@
+# tests/test_rizz_db_connections.py
+"""
+/rizz/* 엔드포인트가 OCR / LLM 호출 동안 DB 커넥션을 잡고 있지 않은지 확인.
+
+LLM(과 OCR)을 스텁으로 바꾸고, 스텁 안에서 engine.pool.checkedout()이 0인지 기록한다.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+
+from app.dependencies import get_ocr_service
+from app.routers import rizz
+
+CONVERSATION = "상대: 오늘 뭐해?\n나: 집에서 쉬는 중"
+
+
+class PoolProbe:
+    """스텁 호출 시점마다 풀에서 빌려 간 커넥션 수 기록."""
+
+    def __init__(self, engine):
+        self.pool = engine.sync_engine.pool
+        self.during_db: list[int] = []
+        self.during_llm: list[int] = []
+        self.during_ocr: list[int] = []
+
+        # 측정 방법 자체가 맞는지 확인용: 쿼리 실행 중에는 1이어야 함
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(*args) -> None:
+            self.during_db.append(self.pool.checkedout())
+
+    async def generate(self, **kwargs) -> list[str]:
+        self.during_llm.append(self.pool.checkedout())
+        return ["답장 1", "답장 2"]
+
+    async def stream(self, **kwargs):
+        self.during_llm.append(self.pool.checkedout())
+        yield "답장 1"
+        self.during_llm.append(self.pool.checkedout())
+        yield "답장 2"
+
+
+class ProbeOCR:
+    def __init__(self, probe: PoolProbe):
+        self.probe = probe
+
+    async def extract_text(self, image_path):
+        raise NotImplementedError
+
+    async def extract_text_from_bytes(self, image_data: bytes, image_format: str) -> str:
+        self.probe.during_ocr.append(self.probe.pool.checkedout())
+        return CONVERSATION
+
+
+@pytest.fixture
+def probe(db_engine, monkeypatch) -> PoolProbe:
+    probe = PoolProbe(db_engine)
+    monkeypatch.setattr(rizz, "generate_suggestions_from_conversation", probe.generate)
+    monkeypatch.setattr(rizz, "stream_suggestions_from_conversation", probe.stream)
+    return probe
+
+
+@pytest.fixture
+async def client(probe):
+    app = FastAPI()
+    app.include_router(rizz.router, prefix="/rizz")
+    app.dependency_overrides[get_ocr_service] = lambda: ProbeOCR(probe)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def _assert_released(probe: PoolProbe, *, ocr: bool = False) -> None:
+    assert probe.during_db and all(count == 1 for count in probe.during_db)
+    assert probe.during_llm and all(count == 0 for count in probe.during_llm)
+    if ocr:
+        assert probe.during_ocr == [0]
+
+
+async def test_generate_releases_connection_before_llm(client, probe, owned_profile):
+    user_id, profile_id = owned_profile
+
+    response = await client.post(
+        "/rizz/generate",
+        json={"user_id": user_id, "profile_id": profile_id, "conversation": CONVERSATION},
+    )
+
+    assert response.status_code == 200
+    _assert_released(probe)
+
+
+async def test_generate_stream_releases_connection_before_llm(client, probe, owned_profile):
+    user_id, profile_id = owned_profile
+
+    response = await client.post(
+        "/rizz/generate/stream",
+        json={"user_id": user_id, "profile_id": profile_id, "conversation": CONVERSATION},
+    )
+
+    assert response.status_code == 200
+    assert "event: done" in response.text
+    _assert_released(probe)
+
+
+async def test_analyze_image_releases_connection_before_ocr_and_llm(client, probe, owned_profile):
+    user_id, profile_id = owned_profile
+
+    response = await client.post(
+        "/rizz/analyze-image",
+        data={"user_id": user_id, "profile_id": profile_id},
+        files={"image": ("chat.png", b"fake-png", "image/png")},
+    )
+
+    assert response.status_code == 200
+    _assert_released(probe, ocr=True)
+
+
+async def test_analyze_image_stream_releases_connection_before_ocr_and_llm(
+    client, probe, owned_profile
+):
+    user_id, profile_id = owned_profile
+
+    response = await client.post(
+        "/rizz/analyze-image/stream",
+        data={"user_id": user_id, "profile_id": profile_id},
+        files={"image": ("chat.png", b"fake-png", "image/png")},
+    )
+
+    assert response.status_code == 200
+    assert "event: done" in response.text
+    _assert_released(probe, ocr=True)